@@ -0,0 +1,426 @@
+"""Benchmark headless do CoverRFSyncEntity em escala, com relógio virtual.
+
+Corre sem Home Assistant: usa o stand-in de ``hass_stub`` e um ciclo de
+eventos cujo relógio só avança quando não há trabalho pronto, pelo que uma
+viagem de 60 s simulados custa apenas o CPU do código da integração.
+
+Cenários:
+
+* ``open_all``     – N covers sem script abrem ao mesmo tempo (``async_open_cover``).
+* ``set_position`` – N covers com script e latência RF recebem
+  ``async_set_cover_position`` para alvos aleatórios; um motor físico simulado
+  reage aos pulsos (arranque e paragem) e dá a posição verdadeira.
+* ``same_direction`` – como ``set_position``, mas com dois alvos seguidos no
+  mesmo sentido: com o motor parado a meio, o pulso seguinte iria ao
+  contrário, pelo que a cover tem de seguir o ciclo completo do botão.
+* ``sensors``      – N covers com sensores de abertura/fecho são acionadas por
+  ``cover_rf_sync.activate_script`` (uma única chamada); o motor simulado liga
+  e desliga os sensores ao arrancar e ao parar.
+* ``remote``       – N covers ligadas a um evento de recetor RF (um código por
+  cover) seguem toques de comando físico: cada toque chega como uma rajada de
+  tramas repetidas e o motor simulado alterna abrir -> parar -> fechar.
+* ``group``        – N covers num grupo nativo, em trios que partilham o mesmo
+  código RF (um script move três motores); o grupo recebe
+  ``async_set_cover_position`` e cada trio deve receber um só pulso por
+  arranque e por paragem.
+
+Métricas: despertares do ciclo, escritas de estado (total e por segundo
+simulado), chamadas de script, CPU por minuto simulado e erro de posição final
+face à verdade (motor simulado ou valor analítico).
+
+Uso::
+
+    python benchmarks/bench_cover.py --covers 500
+    python benchmarks/bench_cover.py --covers 200 --scenario sensors --json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import random
+import sys
+import time
+from typing import Any, Callable
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.dirname(HERE))
+
+import hass_stub  # noqa: E402
+
+hass_stub.install()
+
+PACKAGE = hass_stub.INTEGRATION_PACKAGE
+DOMAIN = "cover_rf_sync"
+
+
+class PhysicalMotor:
+    """Motor de um só botão: cada pulso alterna abrir -> parar -> fechar -> parar.
+
+    Reage ``latency`` segundos após o pulso e pára sozinho nos fins de curso.
+    Opcionalmente liga/desliga os sensores de abertura/fecho ao mover/parar.
+    """
+
+    def __init__(
+        self,
+        hass,
+        duration: float,
+        latency: float,
+        open_sensor: str | None = None,
+        close_sensor: str | None = None,
+    ):
+        self.hass = hass
+        self.velocity = 100.0 / duration
+        self.latency = latency
+        self.open_sensor = open_sensor
+        self.close_sensor = close_sensor
+        self.position = 0.0
+        self.direction: str | None = None  # None = parado
+        self.next_direction = "open"
+        self._since = 0.0
+        self._end_timer: asyncio.TimerHandle | None = None
+
+    def position_now(self) -> float:
+        if self.direction is None:
+            return self.position
+        delta = self.velocity * (self.hass.loop.time() - self._since)
+        pos = self.position + (delta if self.direction == "open" else -delta)
+        return max(0.0, min(100.0, pos))
+
+    def pulse(self) -> None:
+        self.hass.loop.call_later(self.latency, self._react)
+
+    def _react(self) -> None:
+        if self.direction is not None:
+            self._stop()
+            return
+        self.position = self.position_now()
+        self.direction = self.next_direction
+        self._since = self.hass.loop.time()
+        remaining = (100.0 - self.position) if self.direction == "open" else self.position
+        self._end_timer = self.hass.loop.call_later(remaining / self.velocity, self._stop)
+        self._sensor(self.direction, "on")
+
+    def _stop(self) -> None:
+        if self._end_timer is not None:
+            self._end_timer.cancel()
+            self._end_timer = None
+        self.position = self.position_now()
+        direction, self.direction = self.direction, None
+        self.next_direction = "close" if direction == "open" else "open"
+        self._sensor(direction, "off")
+
+    def _sensor(self, direction: str, value: str) -> None:
+        sensor = self.open_sensor if direction == "open" else self.close_sensor
+        if sensor:
+            self.hass.states.async_set(sensor, value)
+
+
+async def _async_setup(hass, count: int, data_for: Callable[[int], dict[str, Any]]) -> list:
+    integration = importlib.import_module(PACKAGE)
+    await integration.async_setup(hass, {})
+    for i in range(count):
+        entry = hass_stub.ConfigEntry(f"bench{i}", f"Bench {i}", data_for(i), domain=DOMAIN)
+        await integration.async_setup_entry(hass, entry)
+    return [
+        e
+        for entities in hass.config_entries.entities.values()
+        for e in entities
+        if e.entity_id.startswith("cover.")
+    ]
+
+
+def _register_motors(hass, motors: dict[str, PhysicalMotor]) -> None:
+    async def _script_turn_on(call):
+        motor = motors.get(call.data["entity_id"])
+        if motor is not None:
+            motor.pulse()
+
+    hass.services.async_register("script", "turn_on", _script_turn_on)
+
+
+async def scenario_open_all(hass, count: int, rng: random.Random) -> tuple[float, list[float]]:
+    durations = [rng.randint(10, 60) for _ in range(count)]
+    entities = await _async_setup(
+        hass,
+        count,
+        lambda i: {"name": f"b{i}", "open_duration": durations[i], "close_duration": durations[i]},
+    )
+    await asyncio.gather(*(e.async_open_cover() for e in entities))
+    await asyncio.sleep(max(durations) + 1)
+    return max(durations) + 1, [abs(e.current_cover_position - 100) for e in entities]
+
+
+async def scenario_set_position(hass, count: int, rng: random.Random) -> tuple[float, list[float]]:
+    durations = [rng.randint(15, 40) for _ in range(count)]
+    latency = 0.4
+    motors = {f"script.b{i}": PhysicalMotor(hass, durations[i], latency) for i in range(count)}
+    _register_motors(hass, motors)
+    entities = await _async_setup(
+        hass,
+        count,
+        lambda i: {
+            "name": f"b{i}",
+            "open_duration": durations[i],
+            "close_duration": durations[i],
+            "script_entity_id": f"script.b{i}",
+            "rf_latency_ms": int(latency * 1000),
+            "tx_group": f"radio{i // 10}",   # 10 covers por transmissor
+            "tx_gap_ms": 300,
+        },
+    )
+    targets = [rng.randint(10, 90) for _ in range(count)]
+    await _async_set_positions(entities, targets)
+    sim = max(durations) + 10
+    await asyncio.sleep(sim)
+    errors = [
+        abs(e.current_cover_position - motors[e._settings.script].position_now())
+        for e in entities
+    ]
+    return sim, errors
+
+
+async def _async_set_positions(entities: list, targets: list[int]) -> None:
+    await asyncio.gather(
+        *(e.async_set_cover_position(position=t) for e, t in zip(entities, targets))
+    )
+
+
+async def scenario_same_direction(
+    hass, count: int, rng: random.Random
+) -> tuple[float, list[float]]:
+    durations = [rng.randint(15, 40) for _ in range(count)]
+    latency = 0.4
+    motors = {f"script.b{i}": PhysicalMotor(hass, durations[i], latency) for i in range(count)}
+    _register_motors(hass, motors)
+    entities = await _async_setup(
+        hass,
+        count,
+        lambda i: {
+            "name": f"b{i}",
+            "open_duration": durations[i],
+            "close_duration": durations[i],
+            "script_entity_id": f"script.b{i}",
+            "rf_latency_ms": int(latency * 1000),
+            "tx_group": f"radio{i // 10}",
+            "tx_gap_ms": 300,
+        },
+    )
+    sim = 0.0
+    first = [rng.randint(20, 50) for _ in range(count)]
+    for targets in (first, [t + rng.randint(15, 40) for t in first]):
+        await _async_set_positions(entities, targets)
+        await asyncio.sleep(max(durations) + 10)
+        sim += max(durations) + 10
+    errors = [
+        abs(e.current_cover_position - motors[e._settings.script].position_now())
+        for e in entities
+    ]
+    return sim, errors
+
+
+async def scenario_sensors(hass, count: int, rng: random.Random) -> tuple[float, list[float]]:
+    durations = [rng.randint(15, 40) for _ in range(count)]
+    latency = 0.3
+    motors = {
+        f"script.b{i}": PhysicalMotor(
+            hass, durations[i], latency, f"binary_sensor.o{i}", f"binary_sensor.c{i}"
+        )
+        for i in range(count)
+    }
+    _register_motors(hass, motors)
+    for i in range(count):
+        hass.states.async_set(f"binary_sensor.o{i}", "off")
+        hass.states.async_set(f"binary_sensor.c{i}", "off")
+    entities = await _async_setup(
+        hass,
+        count,
+        lambda i: {
+            "name": f"b{i}",
+            "open_duration": durations[i],
+            "close_duration": durations[i],
+            "script_entity_id": f"script.b{i}",
+            "open_sensor": f"binary_sensor.o{i}",
+            "close_sensor": f"binary_sensor.c{i}",
+            "tx_group": f"radio{i // 10}",
+            "tx_gap_ms": 300,
+        },
+    )
+    targets = [e.entity_id for e in entities]
+    # Abrir tudo, fechar tudo, e de novo abrir (com paragem a meio via segundo pulso)
+    sim = 0.0
+    for _ in range(2):
+        await hass.services.async_call(
+            DOMAIN, "activate_script", {"entity_id": targets}, blocking=True
+        )
+        await asyncio.sleep(max(durations) + 10)
+        sim += max(durations) + 10
+    await hass.services.async_call(DOMAIN, "activate_script", {"entity_id": targets}, blocking=True)
+    await asyncio.sleep(min(durations) / 2)
+    await hass.services.async_call(DOMAIN, "activate_script", {"entity_id": targets}, blocking=True)
+    await asyncio.sleep(10)
+    sim += min(durations) / 2 + 10
+    errors = [
+        abs(e.current_cover_position - motors[e._settings.script].position_now())
+        for e in entities
+    ]
+    return sim, errors
+
+
+async def scenario_remote(hass, count: int, rng: random.Random) -> tuple[float, list[float]]:
+    durations = [rng.randint(15, 40) for _ in range(count)]
+    motors = [PhysicalMotor(hass, durations[i], 0.0) for i in range(count)]
+    entities = await _async_setup(
+        hass,
+        count,
+        lambda i: {
+            "name": f"b{i}",
+            "open_duration": durations[i],
+            "close_duration": durations[i],
+            "rf_event_type": "rf_received",
+            "rf_event_filter": f"{i:06d}",
+        },
+    )
+
+    async def press_all():
+        # Cada toque: o motor reage à primeira trama; o recetor reporta-a 3 vezes
+        for frame in range(3):
+            for i, motor in enumerate(motors):
+                if frame == 0:
+                    motor._react()
+                hass.bus.async_fire("rf_received", {"code": f"{i:06d}", "protocol": 1})
+            await asyncio.sleep(0.05)
+
+    # Abrir, parar a meio, fechar até ao fim, abrir e parar a um terço
+    await press_all()
+    await asyncio.sleep(min(durations) / 2)
+    await press_all()
+    await asyncio.sleep(2)
+    await press_all()
+    await asyncio.sleep(max(durations) + 5)
+    await press_all()
+    await asyncio.sleep(min(durations) / 3)
+    await press_all()
+    await asyncio.sleep(2)
+    sim = 4 * 0.15 + min(durations) / 2 + 2 + max(durations) + 5 + min(durations) / 3 + 2
+    errors = [abs(e.current_cover_position - m.position_now()) for e, m in zip(entities, motors)]
+    return sim, errors
+
+
+async def scenario_group(hass, count: int, rng: random.Random) -> tuple[float, list[float]]:
+    trios = (count + 2) // 3
+    durations = [rng.randint(15, 40) for _ in range(trios)]
+    latency = 0.4
+    # Um "motor" por script: os três motores do trio recebem o mesmo pulso
+    motors = {f"script.t{t}": PhysicalMotor(hass, durations[t], latency) for t in range(trios)}
+    _register_motors(hass, motors)
+    entities = await _async_setup(
+        hass,
+        count,
+        lambda i: {
+            "name": f"b{i}",
+            "open_duration": durations[i // 3],
+            "close_duration": durations[i // 3],
+            "script_entity_id": f"script.t{i // 3}",
+            "rf_latency_ms": int(latency * 1000),
+            "tx_group": f"radio{i // 30}",   # 10 trios por transmissor
+            "tx_gap_ms": 300,
+        },
+    )
+    integration = importlib.import_module(PACKAGE)
+    members = {"name": "all", "members": [e.entity_id for e in entities]}
+    entry = hass_stub.ConfigEntry("group", "All", members, domain=DOMAIN)
+    await integration.async_setup_entry(hass, entry)
+    group = hass.data[DOMAIN]["groups"][0]
+
+    sim = 0.0
+    # Abrir duas vezes seguidas obriga o trio a seguir o ciclo do botão
+    for position in (40, 70, 10):
+        await group.async_set_cover_position(position=position)
+        await asyncio.sleep(max(durations) + 10)
+        sim += max(durations) + 10
+    errors = [
+        abs(e.current_cover_position - motors[e._settings.script].position_now())
+        for e in entities
+    ]
+    errors.append(abs(group.current_cover_position - 10))
+    return sim, errors
+
+
+SCENARIOS = {
+    "open_all": scenario_open_all,
+    "set_position": scenario_set_position,
+    "same_direction": scenario_same_direction,
+    "sensors": scenario_sensors,
+    "remote": scenario_remote,
+    "group": scenario_group,
+}
+
+
+def run_scenario(name: str, count: int, seed: int) -> dict[str, Any]:
+    loop = hass_stub.VirtualClockLoop()
+    asyncio.set_event_loop(loop)
+    hass = hass_stub.HomeAssistant(loop)
+    rng = random.Random(seed)
+    cpu0 = time.process_time()
+    try:
+        sim, errors = loop.run_until_complete(SCENARIOS[name](hass, count, rng))
+    finally:
+        for task in asyncio.all_tasks(loop):
+            task.cancel()
+        loop.run_until_complete(asyncio.sleep(0))
+        loop.close()
+    cpu = time.process_time() - cpu0
+    writes = hass.states.writes.get("cover", 0)
+    return {
+        "scenario": name,
+        "covers": count,
+        "sim_seconds": round(sim, 1),
+        "wakeups": loop.wakeups,
+        "wakeups_per_s": round(loop.wakeups / sim, 2),
+        "state_writes": writes,
+        "writes_per_s": round(writes / sim, 2),
+        "script_calls": hass.services.calls.get(("script", "turn_on"), 0),
+        "cpu_ms": round(cpu * 1000, 1),
+        "cpu_ms_per_sim_min": round(cpu * 1000 / (sim / 60.0), 1),
+        "max_error": round(max(errors), 2),
+        "mean_error": round(sum(errors) / len(errors), 3),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--covers", type=int, default=500)
+    parser.add_argument("--scenario", choices=["all", *SCENARIOS], default="all")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="saída JSON (uma linha por cenário)")
+    parser.add_argument(
+        "--max-error",
+        type=float,
+        default=None,
+        help="falha se o erro máximo exceder este valor (%%)",
+    )
+    args = parser.parse_args(argv)
+
+    names = list(SCENARIOS) if args.scenario == "all" else [args.scenario]
+    results = [run_scenario(name, args.covers, args.seed) for name in names]
+    if args.json:
+        for result in results:
+            print(json.dumps(result))
+    else:
+        keys = list(results[0])
+        widths = {k: max(len(k), *(len(str(r[k])) for r in results)) for k in keys}
+        print("  ".join(k.ljust(widths[k]) for k in keys))
+        for r in results:
+            print("  ".join(str(r[k]).ljust(widths[k]) for k in keys))
+
+    if args.max_error is not None and any(r["max_error"] > args.max_error for r in results):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
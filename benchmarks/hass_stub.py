@@ -0,0 +1,505 @@
+"""Stand-in mínimo do Home Assistant para o benchmark, com relógio virtual.
+
+Instala em ``sys.modules`` apenas os módulos ``homeassistant.*`` que a
+integração importa, com o comportamento necessário para a exercitar:
+máquina de estados, barramento de eventos, registo de serviços, entradas de
+configuração e plataforma ``cover``. Não pretende ser fiel ao HA em tudo o
+resto; serve para medir a integração isolada e de forma determinística.
+
+O ciclo de eventos (``VirtualClockLoop``) nunca dorme: quando não há nada
+pronto, avança o relógio até ao próximo temporizador. Cada avanço conta como
+um despertar do ciclo.
+"""
+from __future__ import annotations
+
+import asyncio
+import enum
+import importlib
+import json
+import selectors
+import sys
+import types
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+# --- Ciclo de eventos com relógio virtual ------------------------------------
+
+
+class _VirtualSelector(selectors.DefaultSelector):
+    def __init__(self, loop: "VirtualClockLoop"):
+        super().__init__()
+        self._vloop = loop
+
+    def select(self, timeout=None):
+        events = super().select(0)
+        if events or timeout == 0:
+            return events
+        if timeout is None:
+            raise RuntimeError("Ciclo de eventos parado: nada agendado e nada pronto")
+        self._vloop.advance(timeout)
+        return []
+
+
+class VirtualClockLoop(asyncio.SelectorEventLoop):
+    """Ciclo de eventos cujo ``time()`` só avança quando não há trabalho pronto."""
+
+    def __init__(self):
+        self._now = 0.0
+        self.wakeups = 0
+        super().__init__(selector=_VirtualSelector(self))
+
+    def time(self) -> float:
+        return self._now
+
+    def advance(self, seconds: float) -> None:
+        self._now += max(0.0, seconds)
+        self.wakeups += 1
+
+
+# --- homeassistant.core -------------------------------------------------------
+
+
+def callback(func):
+    func._hass_callback = True
+    return func
+
+
+@dataclass
+class State:
+    entity_id: str
+    state: str
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class Event:
+    event_type: str
+    data: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class ServiceCall:
+    domain: str
+    service: str
+    data: dict[str, Any] = field(default_factory=dict)
+
+
+def _dispatch(hass: "HomeAssistant", handler: Callable, *args) -> None:
+    result = handler(*args)
+    if asyncio.iscoroutine(result):
+        hass.loop.create_task(result)
+
+
+class EventBus:
+    def __init__(self, hass: "HomeAssistant"):
+        self._hass = hass
+        self._listeners: dict[str, list[Callable]] = {}
+        self.fired = 0
+
+    def async_listen(
+        self, event_type: str, listener: Callable, event_filter: Callable | None = None
+    ) -> Callable[[], None]:
+        entry = (listener, event_filter)
+        self._listeners.setdefault(event_type, []).append(entry)
+        return lambda: self._listeners[event_type].remove(entry)
+
+    def async_fire(self, event_type: str, data: dict | None = None) -> None:
+        self.fired += 1
+        event = Event(event_type, data or {})
+        for listener, event_filter in list(self._listeners.get(event_type, ())):
+            if event_filter is None or event_filter(event.data):
+                _dispatch(self._hass, listener, event)
+
+
+class StateMachine:
+    def __init__(self, hass: "HomeAssistant"):
+        self._hass = hass
+        self._states: dict[str, State] = {}
+        self.writes: dict[str, int] = {}  # por domínio
+
+    def get(self, entity_id: str) -> State | None:
+        return self._states.get(entity_id)
+
+    def async_set(self, entity_id: str, new_state: str, attributes: dict | None = None) -> None:
+        domain = entity_id.partition(".")[0]
+        self.writes[domain] = self.writes.get(domain, 0) + 1
+        old = self._states.get(entity_id)
+        new = State(entity_id, new_state, dict(attributes or {}))
+        self._states[entity_id] = new
+        self._hass.bus.async_fire(
+            EVENT_STATE_CHANGED, {"entity_id": entity_id, "old_state": old, "new_state": new}
+        )
+
+
+class ServiceRegistry:
+    def __init__(self, hass: "HomeAssistant"):
+        self._hass = hass
+        self._services: dict[tuple[str, str], Callable] = {}
+        self.calls: dict[tuple[str, str], int] = {}
+
+    def async_register(self, domain: str, service: str, handler: Callable, schema=None) -> None:
+        self._services[(domain, service)] = handler
+
+    def has_service(self, domain: str, service: str) -> bool:
+        return (domain, service) in self._services
+
+    async def async_call(
+        self, domain: str, service: str, data: dict | None = None, blocking: bool = False
+    ) -> None:
+        key = (domain, service)
+        self.calls[key] = self.calls.get(key, 0) + 1
+        handler = self._services.get(key)
+        if handler is None:
+            return
+        result = handler(ServiceCall(domain, service, dict(data or {})))
+        if asyncio.iscoroutine(result):
+            if blocking:
+                await result
+            else:
+                self._hass.loop.create_task(result)
+
+
+class HomeAssistant:
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.data: dict[str, Any] = {}
+        self.bus = EventBus(self)
+        self.states = StateMachine(self)
+        self.services = ServiceRegistry(self)
+        self.config_entries = ConfigEntries(self)
+        self.storage: dict[str, Any] = {}  # conteúdo de homeassistant.helpers.storage, por chave
+
+    # Como no HA, as tarefas arrancam ansiosamente por omissão (só em Python >= 3.12)
+    def async_create_task(self, target, name: str | None = None, eager_start: bool = True):
+        return _create_task(self.loop, target, name, eager_start)
+
+    def async_create_background_task(self, target, name: str, eager_start: bool = True):
+        return _create_task(self.loop, target, name, eager_start)
+
+
+def _create_task(loop, target, name: str | None, eager_start: bool) -> asyncio.Task:
+    if eager_start and sys.version_info >= (3, 12):
+        return asyncio.Task(target, loop=loop, name=name, eager_start=True)
+    return loop.create_task(target, name=name)
+
+
+# --- homeassistant.config_entries ---------------------------------------------
+
+
+class ConfigEntry:
+    def __init__(
+        self, entry_id: str, title: str, data: dict, options: dict | None = None, domain: str = ""
+    ):
+        self.entry_id = entry_id
+        self.title = title
+        self.domain = domain
+        self.data = data
+        self.options = options or {}
+        self.update_listeners: list[Callable] = []
+        self._on_unload: list[Callable] = []
+
+    def add_update_listener(self, listener: Callable) -> Callable[[], None]:
+        self.update_listeners.append(listener)
+        return lambda: self.update_listeners.remove(listener)
+
+    def async_on_unload(self, func: Callable) -> None:
+        self._on_unload.append(func)
+
+
+class ConfigEntries:
+    """Só o reencaminhamento para plataformas, que a integração usa no setup."""
+
+    def __init__(self, hass: HomeAssistant):
+        self._hass = hass
+        self.entities: dict[str, list] = {}
+
+    async def async_forward_entry_setups(self, entry: ConfigEntry, platforms) -> None:
+        package = sys.modules[__name__].INTEGRATION_PACKAGE
+        for platform in platforms:
+            module = importlib.import_module(f"{package}.{platform}")
+            added: list = []
+
+            def _add(entities, update_before_add: bool = False, _added=added):
+                _added.extend(entities)
+
+            await module.async_setup_entry(self._hass, entry, _add)
+            for entity in added:
+                if not getattr(entity, "_attr_entity_registry_enabled_default", True):
+                    continue  # desativada no registo, como no HA
+                entity.hass = self._hass
+                entity.entity_id = entity.entity_id or f"{platform}.{entity._attr_unique_id}"
+                entity.platform = types.SimpleNamespace(config_entry=entry)
+                self.entities.setdefault(entry.entry_id, []).append(entity)
+                await entity.async_added_to_hass()
+
+    async def async_unload_platforms(self, entry: ConfigEntry, platforms) -> bool:
+        for entity in self.entities.pop(entry.entry_id, []):
+            await entity.async_will_remove_from_hass()
+        return True
+
+
+INTEGRATION_PACKAGE = "custom_components.cover_rf_sync"
+
+
+# --- Entidades ----------------------------------------------------------------
+
+
+class Entity:
+    entity_id: str | None = None
+    hass: HomeAssistant | None = None
+    _attr_unique_id: str | None = None
+    _attr_name: str | None = None
+    _attr_should_poll = True
+    _unrecorded_attributes: frozenset = frozenset()
+
+    @property
+    def unique_id(self):
+        return self._attr_unique_id
+
+    @property
+    def state(self) -> str | None:
+        return None
+
+    @property
+    def state_attributes(self) -> dict | None:
+        return None
+
+    @property
+    def extra_state_attributes(self) -> dict | None:
+        return None
+
+    def async_write_ha_state(self) -> None:
+        attrs = dict(self.state_attributes or {})
+        attrs.update(self.extra_state_attributes or {})
+        if hasattr(self, "supported_features"):
+            attrs["supported_features"] = self.supported_features
+        self.hass.states.async_set(self.entity_id, self.state, attrs)
+
+    async def async_added_to_hass(self) -> None:
+        pass
+
+    async def async_will_remove_from_hass(self) -> None:
+        pass
+
+
+class CoverEntityFeature(enum.IntFlag):
+    OPEN = 1
+    CLOSE = 2
+    SET_POSITION = 4
+    STOP = 8
+
+
+ATTR_ENTITY_ID = "entity_id"
+EVENT_STATE_CHANGED = "state_changed"
+STATE_UNAVAILABLE = "unavailable"
+STATE_UNKNOWN = "unknown"
+STATE_OPEN = "open"
+STATE_CLOSED = "closed"
+STATE_OPENING = "opening"
+STATE_CLOSING = "closing"
+
+
+class CoverEntity(Entity):
+    @property
+    def is_opening(self):
+        return None
+
+    @property
+    def is_closing(self):
+        return None
+
+    @property
+    def is_closed(self):
+        return None
+
+    @property
+    def current_cover_position(self):
+        return None
+
+    _attr_supported_features = 0
+
+    @property
+    def supported_features(self):
+        return self._attr_supported_features
+
+    @property
+    def state(self):
+        if self.is_opening:
+            return STATE_OPENING
+        if self.is_closing:
+            return STATE_CLOSING
+        closed = self.is_closed
+        if closed is None:
+            return None
+        return STATE_CLOSED if closed else STATE_OPEN
+
+    @property
+    def state_attributes(self):
+        current = self.current_cover_position
+        return {"current_position": current} if current is not None else {}
+
+
+class SensorStateClass(enum.StrEnum):
+    MEASUREMENT = "measurement"
+    TOTAL_INCREASING = "total_increasing"
+
+
+class EntityCategory(enum.StrEnum):
+    DIAGNOSTIC = "diagnostic"
+
+
+class UnitOfTime(enum.StrEnum):
+    MILLISECONDS = "ms"
+    SECONDS = "s"
+
+
+class SensorEntity(Entity):
+    @property
+    def state(self):
+        return getattr(self, "native_value", None)
+
+
+class ExtraStoredData:
+    def as_dict(self) -> dict[str, Any]:
+        raise NotImplementedError
+
+
+class RestoreEntity(Entity):
+    async def async_get_last_state(self):
+        return None
+
+    async def async_get_last_extra_data(self):
+        return None
+
+
+# --- Helpers ------------------------------------------------------------------
+
+
+@dataclass
+class SelectedEntities:
+    referenced: set[str] = field(default_factory=set)
+    indirectly_referenced: set[str] = field(default_factory=set)
+
+
+def async_extract_referenced_entity_ids(
+    hass: HomeAssistant, call: ServiceCall, expand_group: bool = True
+) -> SelectedEntities:
+    entity_ids = call.data.get("entity_id") or []
+    if isinstance(entity_ids, str):
+        entity_ids = [entity_ids]
+    return SelectedEntities(referenced=set(entity_ids))
+
+
+def websocket_command(schema: dict) -> Callable:
+    return lambda func: func
+
+
+def async_register_command(hass: HomeAssistant, handler: Callable) -> None:
+    """O benchmark não tem ligações websocket; os comandos só precisam de existir."""
+
+
+def event_message(msg_id: int, event: Any) -> dict[str, Any]:
+    return {"id": msg_id, "type": "event", "event": event}
+
+
+class Store:
+    """Armazenamento em memória (``hass.storage``), com a gravação adiada do HA."""
+
+    def __init__(self, hass: HomeAssistant, version: int, key: str, private: bool = False):
+        self.hass = hass
+        self.version = version
+        self.key = key
+        self._handle: asyncio.TimerHandle | None = None
+
+    async def async_load(self) -> Any:
+        data = self.hass.storage.get(self.key)
+        return None if data is None else json.loads(data)
+
+    def async_delay_save(self, data_func: Callable[[], Any], delay: float = 0) -> None:
+        # Como no HA: um novo pedido substitui o pendente e volta a contar o atraso
+        if self._handle is not None:
+            self._handle.cancel()
+        self._handle = self.hass.loop.call_later(delay, self._write, data_func)
+
+    def _write(self, data_func: Callable[[], Any]) -> None:
+        self._handle = None
+        self.hass.storage[self.key] = json.dumps(data_func())
+
+    async def async_remove(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self.hass.storage.pop(self.key, None)
+
+
+# --- Instalação em sys.modules ------------------------------------------------
+
+
+class Platform(enum.StrEnum):
+    COVER = "cover"
+    SENSOR = "sensor"
+
+
+def _module(name: str, **attrs) -> types.ModuleType:
+    module = types.ModuleType(name)
+    module.__dict__.update(attrs)
+    sys.modules[name] = module
+    return module
+
+
+def install() -> None:
+    """Regista os módulos ``homeassistant.*`` falsos (substitui um HA instalado)."""
+    for name in [n for n in sys.modules if n == "homeassistant" or n.startswith("homeassistant.")]:
+        del sys.modules[name]
+    _module("homeassistant", __path__=[])
+    _module(
+        "homeassistant.core",
+        HomeAssistant=HomeAssistant, ServiceCall=ServiceCall, State=State, Event=Event,
+        callback=callback,
+    )
+    _module("homeassistant.config_entries", ConfigEntry=ConfigEntry)
+    _module(
+        "homeassistant.const",
+        Platform=Platform, STATE_OPEN=STATE_OPEN, STATE_CLOSED=STATE_CLOSED,
+        STATE_OPENING=STATE_OPENING, STATE_CLOSING=STATE_CLOSING,
+        EntityCategory=EntityCategory, UnitOfTime=UnitOfTime,
+        EVENT_STATE_CHANGED=EVENT_STATE_CHANGED, STATE_UNAVAILABLE=STATE_UNAVAILABLE,
+        STATE_UNKNOWN=STATE_UNKNOWN, ATTR_ENTITY_ID=ATTR_ENTITY_ID,
+    )
+    _module("homeassistant.components", __path__=[])
+    _module(
+        "homeassistant.components.cover",
+        CoverEntity=CoverEntity, CoverEntityFeature=CoverEntityFeature,
+    )
+    _module(
+        "homeassistant.components.sensor",
+        SensorEntity=SensorEntity, SensorStateClass=SensorStateClass,
+    )
+    _module("homeassistant.helpers", __path__=[])
+    _module("homeassistant.helpers.typing", ConfigType=dict)
+    _module(
+        "homeassistant.helpers.config_validation",
+        config_entry_only_config_schema=lambda domain: (lambda config: config),
+        make_entity_service_schema=lambda schema: (lambda data: data),
+        entity_ids=lambda value: value,
+    )
+    _module(
+        "homeassistant.components.websocket_api",
+        websocket_command=websocket_command, async_register_command=async_register_command,
+        event_message=event_message, ActiveConnection=object,
+    )
+    try:
+        importlib.import_module("voluptuous")
+    except ImportError:
+        # Só os marcadores usados nos esquemas dos comandos websocket
+        _module("voluptuous", Required=str, Optional=str)
+    _module(
+        "homeassistant.helpers.service",
+        async_extract_referenced_entity_ids=async_extract_referenced_entity_ids,
+        SelectedEntities=SelectedEntities,
+    )
+    _module(
+        "homeassistant.helpers.restore_state",
+        ExtraStoredData=ExtraStoredData, RestoreEntity=RestoreEntity,
+    )
+    _module("homeassistant.helpers.storage", Store=Store)
@@ -1,31 +1,107 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.service import async_extract_referenced_entity_ids
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 
-from .const import DOMAIN
+from .const import DOMAIN, CONF_MEMBERS, STORAGE_KEY, STORAGE_VERSION
+from .dispatcher import SensorDispatcher
+from .motion import MotionFeed, MotionScheduler
+from .settings import CoverSettings
+from .websocket import async_register_websocket
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS = [Platform.COVER]
+PLATFORMS = [Platform.COVER, Platform.SENSOR]
+GROUP_PLATFORMS = [Platform.COVER]  # entradas de grupo: só a cover agregada
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+SERVICE_ACTIVATE_SCRIPT = "activate_script"
+SERVICE_SCHEMA = cv.make_entity_service_schema({})
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    domain_data.setdefault("entries", {})
+    # Índice entity_id -> entidade, mantido pelas próprias entidades
+    domain_data.setdefault("entities", {})
+    # Grupos nativos ativos (ver cover_group.py); as covers ligam-se a eles ao serem adicionadas
+    domain_data.setdefault("groups", [])
+    # Instrumentação por entrada (sobrevive a recarregamentos; ver diagnostics.py)
+    domain_data.setdefault("stats", {})
+    # Segmentos de movimento para o frontend (cover_rf_sync/subscribe_motion)
+    domain_data.setdefault("motion_feed", MotionFeed())
+    async_register_websocket(hass)
+
+    async def _handle_activate_script(call: ServiceCall) -> None:
+        """Serviço único: resolve alvos (entidades, áreas, etiquetas, dispositivos) e despacha
+        em paralelo."""
+        selected = async_extract_referenced_entity_ids(hass, call)
+        index = hass.data[DOMAIN]["entities"]
+        targets = [
+            index[eid]
+            for eid in selected.referenced | selected.indirectly_referenced
+            if eid in index
+        ]
+        if not targets:
+            return
+        await asyncio.gather(*(entity.async_activate_script() for entity in targets))
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_ACTIVATE_SCRIPT, _handle_activate_script, schema=SERVICE_SCHEMA
+    )
     return True
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN].setdefault("entries", {})
+    if "scheduler" not in hass.data[DOMAIN]:
+        hass.data[DOMAIN]["scheduler"] = MotionScheduler(hass)
+    if "sensors" not in hass.data[DOMAIN]:
+        hass.data[DOMAIN]["sensors"] = SensorDispatcher(hass)
     hass.data[DOMAIN]["entries"][entry.entry_id] = entry
 
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    await hass.config_entries.async_forward_entry_setups(entry, _platforms(entry))
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
     return True
 
+def _platforms(entry: ConfigEntry) -> list[Platform]:
+    return GROUP_PLATFORMS if CONF_MEMBERS in entry.data else PLATFORMS
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Opções alteradas: troca a configuração da cover no lugar, sem recarregar a entrada.
+
+    Grupos (e entradas sem cover carregada) são recarregados.
+    """
+    settings = CoverSettings.from_entry(entry)
+    for entity in hass.data[DOMAIN]["entities"].values():
+        if entity.entry.entry_id == entry.entry_id:
+            entity.async_update_settings(settings)
+            return
+    await hass.config_entries.async_reload(entry.entry_id)
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, _platforms(entry))
     if unload_ok:
         hass.data[DOMAIN]["entries"].pop(entry.entry_id, None)
+        if not hass.data[DOMAIN]["entries"]:
+            scheduler = hass.data[DOMAIN].pop("scheduler", None)
+            if scheduler is not None:
+                scheduler.async_shutdown()
+            dispatcher = hass.data[DOMAIN].pop("sensors", None)
+            if dispatcher is not None:
+                dispatcher.async_shutdown()
+            for transmitter in hass.data[DOMAIN].pop("transmitters", {}).values():
+                transmitter.async_shutdown()
     return unload_ok
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    hass.data.get(DOMAIN, {}).get("stats", {}).pop(entry.entry_id, None)
+    await Store(hass, STORAGE_VERSION, STORAGE_KEY.format(entry_id=entry.entry_id)).async_remove()
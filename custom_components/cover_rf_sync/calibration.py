@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from collections import deque
+from statistics import median
+from typing import Any
+
+CALIBRATION_WINDOW = 9      # amostras guardadas por sentido (janela móvel)
+CALIBRATION_MIN = 3         # amostras necessárias antes de substituir o tempo configurado
+CALIBRATION_SPREAD = 20.0   # % de diferença de percurso para estimar a rampa de arranque
+MIN_DISTANCE = 10.0         # % mínimo de percurso para aceitar uma amostra
+OUTLIER_FACTOR = 2.0        # amostras fora de [1/f, f] x estimativa atual são descartadas
+
+
+class TravelCalibration:
+    """Estimativa robusta dos tempos de viagem aprendida a partir dos sensores.
+
+    Cada amostra é ``(percurso %, segundos)`` medida entre o flanco "on" do
+    sensor da direção (início) e o flanco "off" (fim de curso). Com percursos
+    variados ajusta-se ``t = rampa + percurso * s_por_%`` pelo estimador de
+    Theil-Sen (mediana dos declives entre pares), o que dá uma curva linear por
+    troços: parado durante a rampa, depois velocidade constante. Sem variedade
+    suficiente usa-se apenas a mediana do tempo de viagem completa equivalente.
+    """
+
+    def __init__(self, data: dict[str, Any] | None = None):
+        self._samples: dict[str, deque[tuple[float, float]]] = {
+            "open": deque(maxlen=CALIBRATION_WINDOW),
+            "close": deque(maxlen=CALIBRATION_WINDOW),
+        }
+        self._estimates: dict[str, tuple[float, float] | None] = {"open": None, "close": None}
+        self.revision = 0  # incrementado a cada nova estimativa
+        for direction, samples in ((data or {}).get("samples") or {}).items():
+            if direction not in self._samples:
+                continue
+            for item in samples:
+                try:
+                    self._samples[direction].append((float(item[0]), float(item[1])))
+                except (TypeError, ValueError, IndexError):
+                    continue
+            self._estimates[direction] = self._fit(direction)
+
+    def add_sample(self, direction: str, distance: float, seconds: float, nominal: float) -> bool:
+        """Regista uma viagem; devolve False se foi rejeitada como anómala."""
+        if direction not in self._samples or distance < MIN_DISTANCE or seconds <= 0:
+            return False
+        reference = self.duration(direction, nominal)
+        full = seconds * 100.0 / distance
+        if not reference / OUTLIER_FACTOR <= full <= reference * OUTLIER_FACTOR:
+            return False
+        self._samples[direction].append((distance, seconds))
+        self._estimates[direction] = self._fit(direction)
+        self.revision += 1
+        return True
+
+    def _fit(self, direction: str) -> tuple[float, float] | None:
+        samples = list(self._samples[direction])
+        if len(samples) < CALIBRATION_MIN:
+            return None
+        distances = [d for d, _ in samples]
+        if max(distances) - min(distances) >= CALIBRATION_SPREAD:
+            slopes = [
+                (t2 - t1) / (d2 - d1)
+                for i, (d1, t1) in enumerate(samples)
+                for d2, t2 in samples[i + 1:]
+                if abs(d2 - d1) >= MIN_DISTANCE
+            ]
+            if slopes:
+                slope = median(slopes)
+                if slope > 0:
+                    ramp = median(t - slope * d for d, t in samples)
+                    return slope * 100.0, max(0.0, ramp)
+        return median(t * 100.0 / d for d, t in samples), 0.0
+
+    def duration(self, direction: str, nominal: float) -> float:
+        """Tempo de viagem completa (s): aprendido, ou ``nominal`` na falta de amostras."""
+        estimate = self._estimates.get(direction)
+        return estimate[0] if estimate else float(nominal)
+
+    def ramp(self, direction: str) -> float:
+        """Tempo morto de arranque (s) do troço inicial da curva de viagem."""
+        estimate = self._estimates.get(direction)
+        return estimate[1] if estimate else 0.0
+
+    def learned(self, direction: str) -> bool:
+        return self._estimates.get(direction) is not None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "samples": {d: [list(s) for s in samples] for d, samples in self._samples.items()},
+            "estimates": {
+                d: ({"duration": round(e[0], 2), "ramp": round(e[1], 2)} if e else None)
+                for d, e in self._estimates.items()
+            },
+        }
@@ -1,5 +1,7 @@
 
 from __future__ import annotations
+
+from typing import Any
 import voluptuous as vol
 
 from homeassistant import config_entries
@@ -15,22 +17,86 @@ from .const import (
     CONF_CLOSE_DURATION,
     CONF_SCRIPT_ENTITY_ID,
     CONF_TOLERANCE,
+    CONF_STOP_SCRIPT_ENTITY_ID,
+    CONF_RF_LATENCY,
+    CONF_UPDATE_INTERVAL,
+    CONF_TX_GROUP,
+    CONF_TX_GAP,
+    CONF_TX_REPEAT,
+    CONF_AUTO_CALIBRATE,
+    CONF_CONFIRM_TIMEOUT,
+    CONF_CONFIRM_RETRIES,
+    CONF_OPEN_DEBOUNCE,
+    CONF_CLOSE_DEBOUNCE,
+    CONF_EVENT_ENTITY,
+    CONF_EVENT_TYPE,
+    CONF_EVENT_FILTER,
+    CONF_EVENT_HOLDOFF,
+    CONF_MEMBERS,
+)
+from .settings import (
+    DEFAULT_CLOSE,
+    DEFAULT_CONFIRM_RETRIES,
+    DEFAULT_CONFIRM_TIMEOUT,
+    DEFAULT_DEBOUNCE,
+    DEFAULT_EVENT_HOLDOFF,
+    DEFAULT_OPEN,
+    DEFAULT_TOL,
+    DEFAULT_TX_GAP,
+    DEFAULT_TX_GROUP,
+    DEFAULT_TX_REPEAT,
+    DEFAULT_UPDATE_INTERVAL,
 )
 
 DEFAULT_NAME = "Portão"
-DEFAULT_OPEN = 25
-DEFAULT_CLOSE = 25
-DEFAULT_TOL = 10.0  # %
+DEFAULT_GROUP_NAME = "Grupo"
 
 def _tol_hint(tol: float | None) -> str:
     if tol is not None and tol > 25.0:
-        return "⚠️ Atenção: tolerâncias acima de 25% não são recomendadas e podem levar a comportamentos inesperados."
-    return "Indique a tolerância em percentagem (ex.: 10). Valores acima de 25% não são recomendados."
+        return (
+            "⚠️ Atenção: tolerâncias acima de 25% não são recomendadas "
+            "e podem levar a comportamentos inesperados."
+        )
+    return (
+        "Indique a tolerância em percentagem (ex.: 10). "
+        "Valores acima de 25% não são recomendados."
+    )
+
+def _entity(domain: str):
+    return selector({"entity": {"domain": domain}})
+
+def _number(minimum: float, maximum: float, step: float | None = None, unit: str | None = None):
+    config = {"min": minimum, "max": maximum, "mode": "box"}
+    if step is not None:
+        config["step"] = step
+    if unit is not None:
+        config["unit_of_measurement"] = unit
+    return selector({"number": config})
+
+def _members_selector():
+    return selector({"entity": {"domain": "cover", "integration": DOMAIN, "multiple": True}})
 
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
 
     async def async_step_user(self, user_input=None):
+        """Cover individual ou grupo de covers já configuradas."""
+        return self.async_show_menu(step_id="user", menu_options=["cover", "group"])
+
+    async def async_step_group(self, user_input=None):
+        if user_input is not None:
+            name = user_input.get(CONF_NAME) or DEFAULT_GROUP_NAME
+            members = list(user_input.get(CONF_MEMBERS) or [])
+            data = {CONF_NAME: name, CONF_MEMBERS: members}
+            return self.async_create_entry(title=name, data=data)
+
+        schema = vol.Schema({
+            vol.Optional(CONF_NAME, default=DEFAULT_GROUP_NAME): str,
+            vol.Required(CONF_MEMBERS): _members_selector(),
+        })
+        return self.async_show_form(step_id="group", data_schema=schema)
+
+    async def async_step_cover(self, user_input=None):
         errors = {}
         if user_input is not None:
             name = user_input.get(CONF_NAME) or DEFAULT_NAME
@@ -40,6 +106,22 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             script_entity = user_input.get(CONF_SCRIPT_ENTITY_ID)
             open_sensor = user_input.get(CONF_OPEN_SENSOR)
             close_sensor = user_input.get(CONF_CLOSE_SENSOR)
+            stop_script = user_input.get(CONF_STOP_SCRIPT_ENTITY_ID)
+            rf_latency = user_input.get(CONF_RF_LATENCY)
+            update_interval = float(user_input.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL))
+            tx_group = (user_input.get(CONF_TX_GROUP) or DEFAULT_TX_GROUP).strip()
+            tx_group = tx_group or DEFAULT_TX_GROUP
+            tx_gap = int(user_input.get(CONF_TX_GAP, DEFAULT_TX_GAP))
+            tx_repeat = int(user_input.get(CONF_TX_REPEAT) or DEFAULT_TX_REPEAT)
+            auto_calibrate = bool(user_input.get(CONF_AUTO_CALIBRATE, True))
+            confirm_timeout = float(user_input.get(CONF_CONFIRM_TIMEOUT, DEFAULT_CONFIRM_TIMEOUT))
+            confirm_retries = int(user_input.get(CONF_CONFIRM_RETRIES, DEFAULT_CONFIRM_RETRIES))
+            open_debounce = int(user_input.get(CONF_OPEN_DEBOUNCE, DEFAULT_DEBOUNCE))
+            close_debounce = int(user_input.get(CONF_CLOSE_DEBOUNCE, DEFAULT_DEBOUNCE))
+            event_entity = user_input.get(CONF_EVENT_ENTITY)
+            event_type = (user_input.get(CONF_EVENT_TYPE) or "").strip() or None
+            event_filter = (user_input.get(CONF_EVENT_FILTER) or "").strip() or None
+            event_holdoff = int(user_input.get(CONF_EVENT_HOLDOFF, DEFAULT_EVENT_HOLDOFF))
 
             if tolerance > 25.0:
                 await self._create_tolerance_warning(tolerance)
@@ -52,21 +134,59 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 CONF_SCRIPT_ENTITY_ID: script_entity,
                 CONF_OPEN_SENSOR: open_sensor,
                 CONF_CLOSE_SENSOR: close_sensor,
+                CONF_STOP_SCRIPT_ENTITY_ID: stop_script,
+                CONF_RF_LATENCY: int(rf_latency) if rf_latency is not None else None,
+                CONF_UPDATE_INTERVAL: update_interval,
+                CONF_TX_GROUP: tx_group,
+                CONF_TX_GAP: tx_gap,
+                CONF_TX_REPEAT: tx_repeat,
+                CONF_AUTO_CALIBRATE: auto_calibrate,
+                CONF_CONFIRM_TIMEOUT: confirm_timeout,
+                CONF_CONFIRM_RETRIES: confirm_retries,
+                CONF_OPEN_DEBOUNCE: open_debounce,
+                CONF_CLOSE_DEBOUNCE: close_debounce,
+                CONF_EVENT_ENTITY: event_entity,
+                CONF_EVENT_TYPE: event_type,
+                CONF_EVENT_FILTER: event_filter,
+                CONF_EVENT_HOLDOFF: event_holdoff,
             }
             return self.async_create_entry(title=name, data=data)
 
         desc_ph = {"tol_hint": _tol_hint(None)}
 
         schema = vol.Schema({
-            vol.Optional(CONF_SCRIPT_ENTITY_ID): selector({"entity": {"domain": "script"}}),
+            vol.Optional(CONF_SCRIPT_ENTITY_ID): _entity("script"),
             vol.Optional(CONF_NAME, default=DEFAULT_NAME): str,
-            vol.Optional(CONF_OPEN_DURATION, default=DEFAULT_OPEN): selector({"number": {"min": 1, "max": 600, "mode": "box"}}),
-            vol.Optional(CONF_CLOSE_DURATION, default=DEFAULT_CLOSE): selector({"number": {"min": 1, "max": 600, "mode": "box"}}),
-            vol.Optional(CONF_TOLERANCE, default=DEFAULT_TOL): selector({"number": {"min": 0, "max": 50, "step": 0.5, "mode": "box"}}),
-            vol.Optional(CONF_OPEN_SENSOR): selector({"entity": {"domain": "binary_sensor"}}),
-            vol.Optional(CONF_CLOSE_SENSOR): selector({"entity": {"domain": "binary_sensor"}}),
+            vol.Optional(CONF_OPEN_DURATION, default=DEFAULT_OPEN): _number(1, 600),
+            vol.Optional(CONF_CLOSE_DURATION, default=DEFAULT_CLOSE): _number(1, 600),
+            vol.Optional(CONF_TOLERANCE, default=DEFAULT_TOL): _number(0, 50, 0.5),
+            vol.Optional(CONF_OPEN_SENSOR): _entity("binary_sensor"),
+            vol.Optional(CONF_CLOSE_SENSOR): _entity("binary_sensor"),
+            vol.Optional(CONF_STOP_SCRIPT_ENTITY_ID): _entity("script"),
+            vol.Optional(CONF_RF_LATENCY): _number(0, 5000, 10, "ms"),
+            vol.Optional(
+                CONF_UPDATE_INTERVAL, default=DEFAULT_UPDATE_INTERVAL
+            ): _number(0, 30, 0.1, "s"),
+            vol.Optional(CONF_TX_GROUP, default=DEFAULT_TX_GROUP): selector({"text": {}}),
+            vol.Optional(CONF_TX_GAP, default=DEFAULT_TX_GAP): _number(0, 5000, 10, "ms"),
+            vol.Optional(CONF_TX_REPEAT, default=DEFAULT_TX_REPEAT): _number(1, 5),
+            vol.Optional(CONF_AUTO_CALIBRATE, default=True): selector({"boolean": {}}),
+            vol.Optional(
+                CONF_CONFIRM_TIMEOUT, default=DEFAULT_CONFIRM_TIMEOUT
+            ): _number(0, 120, 0.5, "s"),
+            vol.Optional(CONF_CONFIRM_RETRIES, default=DEFAULT_CONFIRM_RETRIES): _number(0, 10),
+            vol.Optional(CONF_OPEN_DEBOUNCE, default=DEFAULT_DEBOUNCE): _number(0, 5000, 10, "ms"),
+            vol.Optional(CONF_CLOSE_DEBOUNCE, default=DEFAULT_DEBOUNCE): _number(0, 5000, 10, "ms"),
+            vol.Optional(CONF_EVENT_ENTITY): _entity("event"),
+            vol.Optional(CONF_EVENT_TYPE): selector({"text": {}}),
+            vol.Optional(CONF_EVENT_FILTER): selector({"text": {}}),
+            vol.Optional(
+                CONF_EVENT_HOLDOFF, default=DEFAULT_EVENT_HOLDOFF
+            ): _number(0, 5000, 10, "ms"),
         })
-        return self.async_show_form(step_id="user", data_schema=schema, errors=errors, description_placeholders=desc_ph)
+        return self.async_show_form(
+            step_id="cover", data_schema=schema, errors=errors, description_placeholders=desc_ph
+        )
 
     @staticmethod
     @callback
@@ -82,7 +202,11 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 "create",
                 {
                     "title": "Cover RF Sync — Aviso de tolerância",
-                    "message": f"A tolerância configurada ({tolerance:.1f}%) é elevada (>25%). Isto pode causar efeitos indesejados na lógica de extremos e na apresentação do UI.",
+                    "message": (
+                        f"A tolerância configurada ({tolerance:.1f}%) é elevada (>25%). "
+                        "Isto pode causar efeitos indesejados na lógica de extremos "
+                        "e na apresentação do UI."
+                    ),
                     "notification_id": nid,
                 },
                 blocking=False,
@@ -94,39 +218,137 @@ class OptionsFlow(config_entries.OptionsFlow):
     def __init__(self, config_entry: config_entries.ConfigEntry):
         self._entry = config_entry
 
+    def _current(self, key: str, default: Any = None) -> Any:
+        """Valor em vigor: opções gravadas, senão dados da criação, senão ``default``."""
+        return self._entry.options.get(key, self._entry.data.get(key, default))
+
     async def async_step_init(self, user_input=None):
+        if CONF_MEMBERS in self._entry.data:
+            return await self.async_step_group(user_input)
+        cur = self._current
         if user_input is not None:
             tol = user_input.get(CONF_TOLERANCE)
-            tolerance = float(
-                tol if tol is not None
-                else self._entry.options.get(CONF_TOLERANCE, self._entry.data.get(CONF_TOLERANCE, DEFAULT_TOL))
-            )
+            tolerance = float(tol if tol is not None else cur(CONF_TOLERANCE, DEFAULT_TOL))
             if tolerance > 25.0:
                 cf = ConfigFlow()
                 cf.hass = self.hass
                 await cf._create_tolerance_warning(tolerance)
 
+            def pick(key: str, default: Any = None) -> Any:
+                return user_input.get(key, cur(key, default))
+
+            rf_latency = user_input.get(CONF_RF_LATENCY)
+            tx_group = user_input.get(CONF_TX_GROUP) or cur(CONF_TX_GROUP) or DEFAULT_TX_GROUP
             options = {
-                CONF_SCRIPT_ENTITY_ID: user_input.get(CONF_SCRIPT_ENTITY_ID, self._entry.options.get(CONF_SCRIPT_ENTITY_ID, self._entry.data.get(CONF_SCRIPT_ENTITY_ID))),
-                CONF_OPEN_DURATION: int(user_input.get(CONF_OPEN_DURATION) or self._entry.options.get(CONF_OPEN_DURATION) or self._entry.data.get(CONF_OPEN_DURATION) or DEFAULT_OPEN),
-                CONF_CLOSE_DURATION: int(user_input.get(CONF_CLOSE_DURATION) or self._entry.options.get(CONF_CLOSE_DURATION) or self._entry.data.get(CONF_CLOSE_DURATION) or DEFAULT_CLOSE),
+                CONF_SCRIPT_ENTITY_ID: pick(CONF_SCRIPT_ENTITY_ID),
+                CONF_OPEN_DURATION: int(
+                    user_input.get(CONF_OPEN_DURATION) or cur(CONF_OPEN_DURATION) or DEFAULT_OPEN
+                ),
+                CONF_CLOSE_DURATION: int(
+                    user_input.get(CONF_CLOSE_DURATION) or cur(CONF_CLOSE_DURATION) or DEFAULT_CLOSE
+                ),
                 CONF_TOLERANCE: tolerance,
-                CONF_OPEN_SENSOR: user_input.get(CONF_OPEN_SENSOR, self._entry.options.get(CONF_OPEN_SENSOR, self._entry.data.get(CONF_OPEN_SENSOR))),
-                CONF_CLOSE_SENSOR: user_input.get(CONF_CLOSE_SENSOR, self._entry.options.get(CONF_CLOSE_SENSOR, self._entry.data.get(CONF_CLOSE_SENSOR))),
+                CONF_OPEN_SENSOR: pick(CONF_OPEN_SENSOR),
+                CONF_CLOSE_SENSOR: pick(CONF_CLOSE_SENSOR),
+                CONF_STOP_SCRIPT_ENTITY_ID: user_input.get(CONF_STOP_SCRIPT_ENTITY_ID),
+                CONF_RF_LATENCY: int(rf_latency) if rf_latency is not None else None,
+                CONF_UPDATE_INTERVAL: float(pick(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)),
+                CONF_TX_GROUP: tx_group.strip() or DEFAULT_TX_GROUP,
+                CONF_TX_GAP: int(pick(CONF_TX_GAP, DEFAULT_TX_GAP)),
+                CONF_TX_REPEAT: int(
+                    user_input.get(CONF_TX_REPEAT) or cur(CONF_TX_REPEAT) or DEFAULT_TX_REPEAT
+                ),
+                CONF_AUTO_CALIBRATE: bool(pick(CONF_AUTO_CALIBRATE, True)),
+                CONF_CONFIRM_TIMEOUT: float(pick(CONF_CONFIRM_TIMEOUT, DEFAULT_CONFIRM_TIMEOUT)),
+                CONF_CONFIRM_RETRIES: int(pick(CONF_CONFIRM_RETRIES, DEFAULT_CONFIRM_RETRIES)),
+                CONF_OPEN_DEBOUNCE: int(pick(CONF_OPEN_DEBOUNCE, DEFAULT_DEBOUNCE)),
+                CONF_CLOSE_DEBOUNCE: int(pick(CONF_CLOSE_DEBOUNCE, DEFAULT_DEBOUNCE)),
+                CONF_EVENT_ENTITY: user_input.get(CONF_EVENT_ENTITY),
+                CONF_EVENT_TYPE: (user_input.get(CONF_EVENT_TYPE) or "").strip() or None,
+                CONF_EVENT_FILTER: (user_input.get(CONF_EVENT_FILTER) or "").strip() or None,
+                CONF_EVENT_HOLDOFF: int(pick(CONF_EVENT_HOLDOFF, DEFAULT_EVENT_HOLDOFF)),
             }
             return self.async_create_entry(title="", data=options)
 
-        cur = self._entry.options
-        data = self._entry.data
-        cur_tol = cur.get(CONF_TOLERANCE, data.get(CONF_TOLERANCE, DEFAULT_TOL))
+        cur_tol = cur(CONF_TOLERANCE, DEFAULT_TOL)
         desc_ph = {"tol_hint": _tol_hint(cur_tol)}
 
+        def suggested(key: str) -> dict:
+            return {"suggested_value": cur(key)}
+
+        schema = vol.Schema({
+            vol.Optional(
+                CONF_SCRIPT_ENTITY_ID, default=cur(CONF_SCRIPT_ENTITY_ID)
+            ): _entity("script"),
+            vol.Optional(
+                CONF_OPEN_DURATION, default=cur(CONF_OPEN_DURATION, DEFAULT_OPEN)
+            ): _number(1, 600),
+            vol.Optional(
+                CONF_CLOSE_DURATION, default=cur(CONF_CLOSE_DURATION, DEFAULT_CLOSE)
+            ): _number(1, 600),
+            vol.Optional(CONF_TOLERANCE, default=cur_tol): _number(0, 50, 0.5),
+            vol.Optional(CONF_OPEN_SENSOR, default=cur(CONF_OPEN_SENSOR)): _entity("binary_sensor"),
+            vol.Optional(
+                CONF_CLOSE_SENSOR, default=cur(CONF_CLOSE_SENSOR)
+            ): _entity("binary_sensor"),
+            vol.Optional(
+                CONF_STOP_SCRIPT_ENTITY_ID, description=suggested(CONF_STOP_SCRIPT_ENTITY_ID)
+            ): _entity("script"),
+            vol.Optional(
+                CONF_RF_LATENCY, description=suggested(CONF_RF_LATENCY)
+            ): _number(0, 5000, 10, "ms"),
+            vol.Optional(
+                CONF_UPDATE_INTERVAL, default=cur(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)
+            ): _number(0, 30, 0.1, "s"),
+            vol.Optional(
+                CONF_TX_GROUP, default=cur(CONF_TX_GROUP, DEFAULT_TX_GROUP)
+            ): selector({"text": {}}),
+            vol.Optional(
+                CONF_TX_GAP, default=cur(CONF_TX_GAP, DEFAULT_TX_GAP)
+            ): _number(0, 5000, 10, "ms"),
+            vol.Optional(
+                CONF_TX_REPEAT, default=cur(CONF_TX_REPEAT, DEFAULT_TX_REPEAT)
+            ): _number(1, 5),
+            vol.Optional(
+                CONF_AUTO_CALIBRATE, default=cur(CONF_AUTO_CALIBRATE, True)
+            ): selector({"boolean": {}}),
+            vol.Optional(
+                CONF_CONFIRM_TIMEOUT, default=cur(CONF_CONFIRM_TIMEOUT, DEFAULT_CONFIRM_TIMEOUT)
+            ): _number(0, 120, 0.5, "s"),
+            vol.Optional(
+                CONF_CONFIRM_RETRIES, default=cur(CONF_CONFIRM_RETRIES, DEFAULT_CONFIRM_RETRIES)
+            ): _number(0, 10),
+            vol.Optional(
+                CONF_OPEN_DEBOUNCE, default=cur(CONF_OPEN_DEBOUNCE, DEFAULT_DEBOUNCE)
+            ): _number(0, 5000, 10, "ms"),
+            vol.Optional(
+                CONF_CLOSE_DEBOUNCE, default=cur(CONF_CLOSE_DEBOUNCE, DEFAULT_DEBOUNCE)
+            ): _number(0, 5000, 10, "ms"),
+            vol.Optional(
+                CONF_EVENT_ENTITY, description=suggested(CONF_EVENT_ENTITY)
+            ): _entity("event"),
+            vol.Optional(
+                CONF_EVENT_TYPE, description=suggested(CONF_EVENT_TYPE)
+            ): selector({"text": {}}),
+            vol.Optional(
+                CONF_EVENT_FILTER, description=suggested(CONF_EVENT_FILTER)
+            ): selector({"text": {}}),
+            vol.Optional(
+                CONF_EVENT_HOLDOFF, default=cur(CONF_EVENT_HOLDOFF, DEFAULT_EVENT_HOLDOFF)
+            ): _number(0, 5000, 10, "ms"),
+        })
+        return self.async_show_form(
+            step_id="init", data_schema=schema, description_placeholders=desc_ph
+        )
+
+    async def async_step_group(self, user_input=None):
+        if user_input is not None:
+            members = list(user_input.get(CONF_MEMBERS) or [])
+            return self.async_create_entry(title="", data={CONF_MEMBERS: members})
+
         schema = vol.Schema({
-            vol.Optional(CONF_SCRIPT_ENTITY_ID, default=cur.get(CONF_SCRIPT_ENTITY_ID, data.get(CONF_SCRIPT_ENTITY_ID))): selector({"entity": {"domain": "script"}}),
-            vol.Optional(CONF_OPEN_DURATION,  default=cur.get(CONF_OPEN_DURATION,  data.get(CONF_OPEN_DURATION,  DEFAULT_OPEN))):  selector({"number": {"min": 1, "max": 600, "mode": "box"}}),
-            vol.Optional(CONF_CLOSE_DURATION, default=cur.get(CONF_CLOSE_DURATION, data.get(CONF_CLOSE_DURATION, DEFAULT_CLOSE))): selector({"number": {"min": 1, "max": 600, "mode": "box"}}),
-            vol.Optional(CONF_TOLERANCE, default=cur_tol): selector({"number": {"min": 0, "max": 50, "step": 0.5, "mode": "box"}}),
-            vol.Optional(CONF_OPEN_SENSOR,  default=cur.get(CONF_OPEN_SENSOR,  data.get(CONF_OPEN_SENSOR))):  selector({"entity": {"domain": "binary_sensor"}}),
-            vol.Optional(CONF_CLOSE_SENSOR, default=cur.get(CONF_CLOSE_SENSOR, data.get(CONF_CLOSE_SENSOR))): selector({"entity": {"domain": "binary_sensor"}}),
+            vol.Required(
+                CONF_MEMBERS, default=self._current(CONF_MEMBERS, [])
+            ): _members_selector(),
         })
-        return self.async_show_form(step_id="init", data_schema=schema, description_placeholders=desc_ph)
+        return self.async_show_form(step_id="group", data_schema=schema)
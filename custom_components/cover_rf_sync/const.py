@@ -9,10 +9,38 @@ CONF_OPEN_DURATION = "open_duration"     # segundos para viagem completa a abrir
 CONF_CLOSE_DURATION = "close_duration"   # segundos para viagem completa a fechar
 CONF_SCRIPT_ENTITY_ID = "script_entity_id"
 CONF_TOLERANCE = "tolerance_percent"     # percentagem (0..50)
+CONF_STOP_SCRIPT_ENTITY_ID = "stop_script_entity_id"  # script de paragem (omissão: o script)
+CONF_RF_LATENCY = "rf_latency_ms"        # atraso script -> motor (ms); vazio = medido
+CONF_UPDATE_INTERVAL = "update_interval" # s entre atualizações em movimento (0 = só início/fim)
+CONF_TX_GROUP = "tx_group"               # grupo de transmissor RF partilhado (fila comum)
+CONF_TX_GAP = "tx_gap_ms"                # intervalo mínimo entre tramas RF do grupo (ms)
+CONF_TX_REPEAT = "tx_repeat"             # nº de emissões de cada trama
+CONF_AUTO_CALIBRATE = "auto_calibrate"   # aprender tempos de viagem com os dois sensores
+CONF_CONFIRM_TIMEOUT = "confirm_timeout" # s à espera do sensor após o pulso (0 = sem limite)
+CONF_CONFIRM_RETRIES = "confirm_retries" # reenvios do script (recuo exponencial) antes de desistir
+CONF_OPEN_DEBOUNCE = "open_sensor_debounce_ms"    # janela anti-ressalto do sensor de abertura (ms)
+CONF_CLOSE_DEBOUNCE = "close_sensor_debounce_ms"  # janela anti-ressalto do sensor de fecho (ms)
+CONF_EVENT_ENTITY = "event_entity_id"    # entidade event do recetor RF (toques do comando)
+CONF_EVENT_TYPE = "rf_event_type"        # ou tipo de evento do barramento emitido pelo recetor RF
+CONF_EVENT_FILTER = "rf_event_filter"    # filtro "chave=valor, ..." (valor solto = código)
+CONF_EVENT_HOLDOFF = "rf_event_holdoff_ms"  # repetições da trama dentro deste tempo = um só toque
+CONF_MEMBERS = "members"                 # entrada de grupo: covers comandadas em conjunto
+
+# Persistência por entrada (homeassistant.helpers.storage)
+STORAGE_VERSION = 1
+STORAGE_KEY = DOMAIN + ".{entry_id}"
+STORAGE_SAVE_DELAY = 1.0  # s; agrega gravações seguidas (paragem, chegada, calibração)
+
+# Eventos
+EVENT_PENDING_TIMEOUT = f"{DOMAIN}_pending_timeout"  # sensor nunca confirmou o arranque
 
 # Attributes
 ATTR_NEXT_ACTION = "next_action"         # "open" | "close" | "stop"
 ATTR_SCRIPT_CONFIGURED = "script_configured_entity_id"
 ATTR_SCRIPT_RUNNING = "script_running_entity_id"
 ATTR_IS_MOVING = "is_moving"
-ATTR_LAST_TRIGGER = "last_trigger"       # "user_open"|"user_close"|"sensor_open"|"sensor_close"|"service"|"stop"
+# "user_open"|"user_close"|"sensor_open"|"sensor_close"|"remote_open"|"remote_close"
+# |"remote_stop"|"service"|"stop"
+ATTR_LAST_TRIGGER = "last_trigger"
+ATTR_LEARNED_OPEN = "learned_open_duration"    # s (viagem completa aprendida) ou None
+ATTR_LEARNED_CLOSE = "learned_close_duration"  # s (viagem completa aprendida) ou None
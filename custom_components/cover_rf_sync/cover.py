@@ -1,62 +1,90 @@
 
 from __future__ import annotations
 import asyncio
+import functools
 import logging
+import time
 from typing import Optional, Dict, Any
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.components.cover import (
-    CoverEntity,
-    CoverEntityFeature,
-)
+from homeassistant.components.cover import CoverEntity
 from homeassistant.const import (
-    STATE_OPENING,
-    STATE_CLOSING,
     STATE_OPEN,
     STATE_CLOSED,
 )
-from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.helpers.restore_state import ExtraStoredData, RestoreEntity
+from homeassistant.helpers.storage import Store
 
 from .const import (
     DOMAIN,
-    CONF_OPEN_SENSOR,
-    CONF_CLOSE_SENSOR,
-    CONF_OPEN_DURATION,
-    CONF_CLOSE_DURATION,
-    CONF_SCRIPT_ENTITY_ID,
-    CONF_TOLERANCE,
+    CONF_MEMBERS,
+    EVENT_PENDING_TIMEOUT,
     ATTR_NEXT_ACTION,
     ATTR_SCRIPT_CONFIGURED,
     ATTR_SCRIPT_RUNNING,
     ATTR_IS_MOVING,
     ATTR_LAST_TRIGGER,
+    ATTR_LEARNED_OPEN,
+    ATTR_LEARNED_CLOSE,
+    STORAGE_KEY,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+from .calibration import TravelCalibration
+from .cover_group import CoverRFSyncGroup
+from .stats import EntryStats
+from .motion import MotionScheduler, MotionSegment
+from .settings import CoverSettings
+from .state import (
+    EVENT_ARRIVE_CLOSE,
+    EVENT_ARRIVE_OPEN,
+    EVENT_RESET,
+    EVENT_START_CLOSE,
+    EVENT_START_OPEN,
+    EVENT_STOP,
+    FEATURES,
+    ZONE_CLOSED,
+    ZONE_OPEN,
+    position_zone,
+    transition,
 )
+from .transmit import PRIORITY_MOVE, PRIORITY_STOP, async_get_transmitter
 
 _LOGGER = logging.getLogger(__name__)
 
-DEFAULT_OPEN = 25
-DEFAULT_CLOSE = 25
-DEFAULT_TOL = 10.0  # %
+LATENCY_ALPHA = 0.3  # peso de cada nova amostra na média móvel da latência medida
+LATENCY_MAX = 10.0  # s; amostras acima disto são descartadas (pulso perdido, etc.)
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
-    """Adicionar a entidade de cover da integração."""
+    """Adicionar a entidade de cover da integração (ou o grupo, numa entrada de grupo)."""
+    if CONF_MEMBERS in entry.data:
+        async_add_entities([CoverRFSyncGroup(hass, entry)])
+        return
     entity = CoverRFSyncEntity(hass, entry)
     async_add_entities([entity])
 
-    # Serviço por entidade: cover_rf_sync.activate_script
-    async def _handle_activate_script(call):
-        target_eid = call.data.get("entity_id")
-        if not target_eid or target_eid != entity.entity_id:
-            return
-        await entity.async_activate_script()
+class CoverRFSyncExtraData(ExtraStoredData):
+    """Estado persistido entre reinícios (posição, próxima ação e segmento em curso)."""
 
-    hass.services.async_register(DOMAIN, "activate_script", _handle_activate_script)
+    def __init__(self, data: dict[str, Any]):
+        self.data = data
 
-class CoverRFSyncEntity(CoverEntity):
+    def as_dict(self) -> dict[str, Any]:
+        return self.data
+
+class CoverRFSyncEntity(CoverEntity, RestoreEntity):
     """Cover lógica que sincroniza com sensores/tempo e expõe próxima ação."""
 
     _attr_should_poll = False
+    # Atributos de alta rotação/redundantes que não vão para o recorder
+    _unrecorded_attributes = frozenset({
+        ATTR_IS_MOVING,
+        ATTR_SCRIPT_CONFIGURED,
+        ATTR_SCRIPT_RUNNING,
+        ATTR_LEARNED_OPEN,
+        ATTR_LEARNED_CLOSE,
+    })
 
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry):
         self.hass = hass
@@ -65,217 +93,940 @@ class CoverRFSyncEntity(CoverEntity):
         self._attr_unique_id = self._unique_id
         self._attr_name = entry.title or "Portão"
 
-        data = entry.data
-        options = entry.options or {}
-
-        # Config
-        self._open_duration: int = options.get(CONF_OPEN_DURATION) or data.get(CONF_OPEN_DURATION) or DEFAULT_OPEN
-        self._close_duration: int = options.get(CONF_CLOSE_DURATION) or data.get(CONF_CLOSE_DURATION) or DEFAULT_CLOSE
-        tol_opt = options.get(CONF_TOLERANCE, data.get(CONF_TOLERANCE, DEFAULT_TOL))
-        try:
-            self._tol: float = max(0.0, min(50.0, float(tol_opt)))
-        except (ValueError, TypeError):
-            self._tol = DEFAULT_TOL
-
-        self._open_sensor: str | None = options.get(CONF_OPEN_SENSOR) or data.get(CONF_OPEN_SENSOR)
-        self._close_sensor: str | None = options.get(CONF_CLOSE_SENSOR) or data.get(CONF_CLOSE_SENSOR)
-        self._script_configured: str | None = options.get(CONF_SCRIPT_ENTITY_ID) or data.get(CONF_SCRIPT_ENTITY_ID)
+        # Config (imutável; substituída inteira por async_update_settings)
+        self._settings: CoverSettings = CoverSettings.from_entry(entry)
+        # Posição, movimento e calibração gravados a cada paragem/chegada (ver _persisted_data)
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY.format(entry_id=entry.entry_id))
 
         # Estado
         self._is_moving: bool = False
         self._position: float = 0.0  # 0 fechado, 100 aberto
         self._state: str = STATE_CLOSED
         self._next_action: str = "open"  # "open" | "close" | "stop"
+        self._attr_supported_features = FEATURES["open"]
+        self._attrs_key: tuple | None = None  # entradas dos atributos em cache
+        self._attrs: dict[str, Any] = {}
         self._last_trigger: str | None = None
         self._script_running: str | None = None
+        self._motion: MotionSegment | None = None  # segmento ativo (posição lazy)
+        self._motion_done: asyncio.Future | None = None
+        self._motion_task: asyncio.Task | None = None  # única tarefa de movimento da entidade
+
+        # Paragem física no alvo (set_position) e latência RF medida
+        self._stop_timer: asyncio.TimerHandle | None = None
+        self._stop_future: asyncio.Future | None = None  # pulso de paragem do segmento ativo
+        self._physical: bool = False  # segmento ativo corresponde a movimento real do motor
+        self._script_sent_at: float | None = None
+        self._latency_measured: float | None = None
+        self._tx_future: asyncio.Future | None = None  # pulso de arranque na fila do transmissor
+
+        # Calibração dos tempos de viagem: (direção, instante do flanco "on", posição inicial)
+        self._calibration = TravelCalibration()
+        self._calib_run: tuple[str, float, float] | None = None
+
+        # Instrumentação (por entrada; ver diagnostics.py)
+        self._stats: EntryStats = hass.data[DOMAIN]["stats"].setdefault(
+            entry.entry_id, EntryStats()
+        )
+        self._command_at: float | None = None   # instante do último comando (comando -> arranque)
+        self._movement_writes = 0
+
+        # Escritas de progresso limitadas/agregadas (transições escrevem sempre)
+        self._last_write: float = 0.0
+        self._write_handle: asyncio.TimerHandle | None = None
+        self._motion_key: tuple | None = None  # último segmento publicado (ver websocket.py)
+        self._groups: list[CoverRFSyncGroup] = []  # notificados a cada escrita (ver cover_group.py)
 
         # Arranque pendente quando aguardamos sensor
-        self._pending_start: Optional[Dict[str, Any]] = None  # {"direction": "...", "target": int|None}
+        # {"direction": "...", "target": int|None, "attempt": int}
+        self._pending_start: Optional[Dict[str, Any]] = None
+        self._pending_timer: asyncio.TimerHandle | None = None  # prazo de confirmação pelo sensor
 
         # Unsubs
         self._unsub_open = None
         self._unsub_close = None
+        self._unsub_event = None
 
-    # Botões dinâmicos
-    @property
-    def supported_features(self) -> int:
-        base = CoverEntityFeature.SET_POSITION
-        if self._is_moving or self._next_action == "stop":
-            return base | CoverEntityFeature.OPEN | CoverEntityFeature.CLOSE | CoverEntityFeature.STOP
-        if self._next_action == "open":
-            return base | CoverEntityFeature.OPEN
-        if self._next_action == "close":
-            return base | CoverEntityFeature.CLOSE
-        return base | CoverEntityFeature.OPEN | CoverEntityFeature.CLOSE
+    # Máquina de estados (ver state.py)
+    def _transition(self, event: str):
+        """Único ponto onde estado e próxima ação mudam; atualiza os botões se preciso."""
+        zone = position_zone(self._position, self._settings.tolerance)
+        state, next_action = transition(self._state, self._next_action, event, zone)
+        self._set_state(state, next_action)
+
+    def _set_state(self, state: str, next_action: str):
+        self._state = state
+        if next_action != self._next_action:
+            self._next_action = next_action
+            # Botões dinâmicos: só recalculados quando a próxima ação muda
+            self._attr_supported_features = FEATURES[next_action]
 
     # Ciclo de vida
     async def async_added_to_hass(self):
-        if self._open_sensor:
-            self._unsub_open = async_track_state_change_event(
-                self.hass, [self._open_sensor], self._handle_open_sensor
+        await super().async_added_to_hass()
+        self.hass.data[DOMAIN]["entities"][self.entity_id] = self
+        for group in self.hass.data[DOMAIN]["groups"]:
+            group.async_attach(self)
+        restored = await self._async_restore()
+        self._subscribe_sensors()
+        self._subscribe_remote()
+        if not restored:
+            self._transition(EVENT_RESET)
+        if not self._is_moving:
+            self.async_write_ha_state()
+
+    def _subscribe_sensors(self, directions: tuple[str, ...] = ("open", "close")):
+        """Subscrição partilhada por todas as covers, com anti-ressalto por sensor (dispatcher.py).
+
+        Só as direções indicadas são (re)ligadas; as restantes ficam intactas.
+        """
+        dispatcher = self.hass.data[DOMAIN]["sensors"]
+        settings = self._settings
+        if "open" in directions:
+            if self._unsub_open:
+                self._unsub_open()
+                self._unsub_open = None
+            if settings.open_sensor:
+                self._unsub_open = dispatcher.async_register(
+                    settings.open_sensor, self, "open", settings.open_debounce
+                )
+        if "close" in directions:
+            if self._unsub_close:
+                self._unsub_close()
+                self._unsub_close = None
+            if settings.close_sensor:
+                self._unsub_close = dispatcher.async_register(
+                    settings.close_sensor, self, "close", settings.close_debounce
+                )
+
+    def _subscribe_remote(self):
+        dispatcher = self.hass.data[DOMAIN]["sensors"]
+        settings = self._settings
+        if settings.event_entity:
+            self._unsub_event = dispatcher.async_register_event_entity(
+                settings.event_entity, self, settings.event_entity_match, settings.event_holdoff
             )
-        if self._close_sensor:
-            self._unsub_close = async_track_state_change_event(
-                self.hass, [self._close_sensor], self._handle_close_sensor
+        elif settings.event_type:
+            self._unsub_event = dispatcher.async_register_event_type(
+                settings.event_type, self, settings.event_match, settings.event_holdoff
             )
-        self._apply_next_action_from_position()
+
+    @callback
+    def async_update_settings(self, settings: CoverSettings):
+        """Aplica novas opções sem recriar a entidade: mantém posição e movimento em curso."""
+        old = self._settings
+        if settings == old:
+            return
+        self._settings = settings
+
+        # Só re-subscreve o que mudou (cada sensor com o seu anti-ressalto)
+        changed = tuple(
+            direction
+            for direction in ("open", "close")
+            if old.sensor_binding(direction) != settings.sensor_binding(direction)
+        )
+        if changed:
+            self._subscribe_sensors(changed)
+        if old.remote_binding != settings.remote_binding:
+            if self._unsub_event:
+                self._unsub_event()
+                self._unsub_event = None
+            self._subscribe_remote()
+
+        if self._is_moving and self._motion is not None:
+            # Reescala o segmento para a nova duração a partir da posição atual
+            # (também reprograma o pulso de paragem e o próximo refresh)
+            self._retarget(self._motion.target)
+        elif settings.tolerance != old.tolerance and not (
+            settings.tolerance < self._position < 100.0 - settings.tolerance
+        ):
+            # Passou a estar dentro da tolerância de um extremo
+            self._transition(EVENT_RESET)
         self.async_write_ha_state()
 
+    @property
+    def extra_restore_state_data(self) -> CoverRFSyncExtraData:
+        """Lido só quando o HA grava os estados (periodicamente e ao encerrar)."""
+        return CoverRFSyncExtraData(self._persisted_data())
+
+    def _persisted_data(self) -> dict[str, Any]:
+        """Estado a gravar, avaliado no instante da escrita (posição viva, se em movimento)."""
+        data: dict[str, Any] = {
+            "position": self._live_position(),
+            "state": self._state,
+            "next_action": self._next_action,
+            "last_trigger": self._last_trigger,
+            "motion": None,
+            "calibration": self._calibration.as_dict(),
+        }
+        motion = self._motion
+        if motion is not None and self._is_moving:
+            # Instante de início em relógio de parede, para extrapolar o tempo parado
+            data["motion"] = {
+                "direction": motion.direction,
+                "origin": motion.origin,
+                "target": motion.target,
+                "velocity": motion.velocity,
+                "ramp": motion.ramp,
+                "start_wall": time.time() - (self.hass.loop.time() - motion.start),
+                "physical": self._physical,
+            }
+        return data
+
+    @callback
+    def _async_save(self):
+        self._store.async_delay_save(self._persisted_data, STORAGE_SAVE_DELAY)
+
+    async def _async_restore(self) -> bool:
+        """Repõe a posição guardada; um movimento interrompido é extrapolado.
+
+        O armazenamento da entrada tem precedência; o estado de restauro do HA
+        (gravado periodicamente e ao encerrar) fica para instalações anteriores.
+        """
+        data = await self._store.async_load()
+        if not data:
+            extra = await self.async_get_last_extra_data()
+            data = extra.as_dict() if extra is not None else None
+        if not data:
+            last = await self.async_get_last_state()
+            position = last.attributes.get("current_position") if last is not None else None
+            if position is None:
+                return False
+            data = {"position": position}
+        try:
+            self._position = max(0.0, min(100.0, float(data["position"])))
+        except (KeyError, ValueError, TypeError):
+            return False
+        next_action, state = data.get("next_action"), data.get("state")
+        if next_action in ("open", "close") and state in (STATE_OPEN, STATE_CLOSED):
+            self._set_state(state, next_action)
+        else:
+            self._transition(EVENT_RESET)
+        self._last_trigger = data.get("last_trigger")
+        if data.get("calibration"):
+            self._calibration = TravelCalibration(data["calibration"])
+
+        motion = data.get("motion")
+        if not motion:
+            return True
+        try:
+            direction = motion["direction"]
+            target = float(motion["target"])
+            elapsed = max(0.0, time.time() - float(motion["start_wall"]))
+            ramp = float(motion.get("ramp") or 0.0)
+            velocity = float(motion["velocity"])
+            position = float(motion["origin"]) + velocity * max(0.0, elapsed - ramp)
+        except (KeyError, ValueError, TypeError):
+            return True
+        if direction not in ("open", "close"):
+            return True
+        reached = position >= target if direction == "open" else position <= target
+        if reached:
+            # Chegou durante a paragem: fica no alvo, como se tivesse terminado aqui
+            self._position = max(0.0, min(100.0, target))
+            self._transition(EVENT_ARRIVE_OPEN if direction == "open" else EVENT_ARRIVE_CLOSE)
+            return True
+        # Ainda em viagem: continua a partir da posição extrapolada
+        self._position = max(0.0, min(100.0, position))
+        # O motor nunca parou: só resta a parte da rampa ainda não decorrida
+        self._begin_movement(
+            direction, target, physical=bool(motion.get("physical")), ramp=max(0.0, ramp - elapsed)
+        )
+        return True
+
     async def async_will_remove_from_hass(self):
+        entities = self.hass.data[DOMAIN]["entities"]
+        if entities.get(self.entity_id) is self:
+            entities.pop(self.entity_id)
+        for group in tuple(self._groups):
+            group.async_detach(self)
+        if self._motion_task is not None:
+            self._motion_task.cancel()
+            self._motion_task = None
+        self._release_motion()
+        self._cancel_stop_timer()
+        self._cancel_tx()
+        self._clear_pending()
+        if self._write_handle is not None:
+            self._write_handle.cancel()
+            self._write_handle = None
         if self._unsub_open:
-            self._unsub_open(); self._unsub_open = None
+            self._unsub_open()
+            self._unsub_open = None
         if self._unsub_close:
-            self._unsub_close(); self._unsub_close = None
+            self._unsub_close()
+            self._unsub_close = None
+        if self._unsub_event:
+            self._unsub_event()
+            self._unsub_event = None
 
     # Ações do utilizador
     async def async_open_cover(self, **kwargs):
+        self._command_at = self.hass.loop.time()
         self._last_trigger = "user_open"
         await self._start_movement("open", call_script=True)
 
     async def async_close_cover(self, **kwargs):
+        self._command_at = self.hass.loop.time()
         self._last_trigger = "user_close"
         await self._start_movement("close", call_script=True)
 
     async def async_set_cover_position(self, **kwargs):
-        target = int(kwargs.get("position", round(self._position)))
-        direction = "open" if target > self._position else "close" if target < self._position else None
+        current = self._live_position()
+        target = int(kwargs.get("position", round(current)))
+        direction = "open" if target > current else "close" if target < current else None
         if not direction:
             return
+        self._command_at = self.hass.loop.time()
         self._last_trigger = f"user_set_position_{target}"
-        await self._start_movement(direction, call_script=False, target_position=target)
+
+        # Já a mover no mesmo sentido: basta reprogramar o prazo de paragem
+        motion = self._motion
+        if self._is_moving and motion is not None and motion.direction == direction:
+            self._command_at = None  # não há arranque a medir
+            self._retarget(float(target))
+            self._async_write_progress()
+            return
+
+        # Motor a mover ao contrário: paragem com prioridade e novo arranque no sentido pedido
+        if self._is_moving and self._physical and self._settings.script:
+            self._reverse_moving(direction, target)
+            return
+
+        await self._start_movement(
+            direction, call_script=not self._is_moving, target_position=target
+        )
 
     async def async_stop_cover(self, **kwargs):
-        self._pending_start = None
+        self._stop_motion("stop")
+
+    @callback
+    def _stop_motion(self, trigger: str):
+        """Pára a simulação na posição atual e decide a próxima ação."""
+        self._clear_pending()
+        self._command_at = None  # um comando que acaba em paragem não mede arranque
+        self._calib_run = None
+        self._cancel_tx()
+        if self._is_moving:
+            self._stats.finish_movement(self._movement_writes + 1)
+            self._movement_writes = 0
+        self._settle_position()
         self._is_moving = False
         self._script_running = None
+        self._release_motion()
+        self._cancel_stop_timer()
+        self._stop_future = None
 
-        tol = self._tol
-        if self._position <= tol:
-            self._state = STATE_CLOSED
-            self._next_action = "open"
-        elif self._position >= 100.0 - tol:
-            self._state = STATE_OPEN
-            self._next_action = "close"
-        else:
-            if self._state == STATE_OPENING:
-                self._next_action = "close"
-            elif self._state == STATE_CLOSING:
-                self._next_action = "open"
-            self._state = STATE_OPEN if self._position >= 50 else STATE_CLOSED
-
-        self._last_trigger = "stop"
+        self._transition(EVENT_STOP)
+        self._last_trigger = trigger
         self.async_write_ha_state()
+        self._async_save()
 
     async def async_activate_script(self):
         """Serviço: chama o script configurado para esta cover."""
-        if not self._script_configured:
+        if not self._settings.script:
             return
-        await self.hass.services.async_call(
-            "script", "turn_on", {"entity_id": self._script_configured}, blocking=False
-        )
-        self._script_running = self._script_configured
+        self._command_at = self.hass.loop.time()
+        # Em movimento o pulso pára o motor (ciclo abrir -> parar -> fechar):
+        # a simulação pára quando o pulso sair de facto, mais a latência RF
+        if self._is_moving:
+            self._stop_when_sent(self._transmit(self._settings.script, PRIORITY_STOP))
+            return
+        sent = self._transmit(self._settings.script)
         self._last_trigger = "service"
         self.async_write_ha_state()
 
-        # Sem sensor para a direção, arranca já; com sensor, aguarda
-        if self._next_action == "open" and not self._open_sensor:
-            await self._begin_movement("open", target_position=None)
-        elif self._next_action == "close" and not self._close_sensor:
-            await self._begin_movement("close", target_position=None)
+        # Sem sensor para a direção, arranca quando o pulso sair (mais a latência RF);
+        # com sensor, aguarda
+        if self._next_action == "open" and not self._settings.open_sensor:
+            self._begin_when_sent(sent, "open", None)
+        elif self._next_action == "close" and not self._settings.close_sensor:
+            self._begin_when_sent(sent, "close", None)
         else:
             if self._next_action in ("open", "close"):
-                self._pending_start = {"direction": self._next_action, "target": None}
+                self._tx_future = sent
+                self._set_pending(self._next_action, None, sent)
                 self.async_write_ha_state()
 
     # Sensores
-    async def _handle_open_sensor(self, event):
-        new_state = event.data.get("new_state")
-        if not new_state:
+    @callback
+    def _handle_sensor(self, direction: str, on: bool):
+        """Flanco do sensor da direção, já filtrado pelo despachante partilhado."""
+        if not on:
+            self._calibration_end(direction)
             return
-        if str(new_state.state).lower() in ("on", "true", "opening", "open"):
-            self._last_trigger = "sensor_open"
-            if self._pending_start and self._pending_start.get("direction") == "open":
-                target = self._pending_start.get("target")
-                self._pending_start = None
-                await self._begin_movement("open", target)
-                return
-            await self._begin_movement("open", 100)
+        self._last_trigger = f"sensor_{direction}"
+        motion = self._motion
+        if (
+            not self._pending_start and self._is_moving and self._physical
+            and motion is not None and motion.direction == direction
+        ):
+            # Já a mover neste sentido (ex.: toque do comando RF): o sensor só confirma
+            self._calibration_start(direction)
+            return
+        # O motor arrancou: qualquer arranque pendente (em qualquer sentido) está
+        # resolvido, e um reenvio ou pulso ainda na fila pararia o motor
+        pending = self._pending_start
+        self._clear_pending()
+        self._cancel_tx()
+        if pending and pending.get("direction") == direction:
+            self._record_latency()
+            self._begin_movement(direction, pending.get("target"), physical=True)
+        else:
+            self._begin_movement(direction, 100 if direction == "open" else 0, physical=True)
+        self._calibration_start(direction)
 
-    async def _handle_close_sensor(self, event):
-        new_state = event.data.get("new_state")
-        if not new_state:
+    # Comando RF
+    @callback
+    def _handle_press(self):
+        """Toque do comando RF (repetições já filtradas): segue o ciclo abrir -> parar -> fechar."""
+        self._command_at = self.hass.loop.time()
+        if self._is_moving:
+            self._stop_motion("remote_stop")
             return
-        if str(new_state.state).lower() in ("on", "true", "closing", "closed"):
-            self._last_trigger = "sensor_close"
-            if self._pending_start and self._pending_start.get("direction") == "close":
-                target = self._pending_start.get("target")
-                self._pending_start = None
-                await self._begin_movement("close", target)
-                return
-            await self._begin_movement("close", 0)
+        self._clear_pending()
+        self._cancel_tx()
+        direction = "close" if self._next_action == "close" else "open"
+        self._last_trigger = f"remote_{direction}"
+        # O motor arranca já com o toque; um sensor da direção, se existir, só confirma
+        self._begin_movement(direction, None, physical=True)
 
     # Núcleo de movimento
     async def _start_movement(self, direction: str, call_script: bool, target_position: int | None = None):
         if direction not in ("open", "close"):
             return
 
-        # Se já em movimento e comando chamaria script -> STOP
-        if self._is_moving and call_script:
+        # Se já em movimento (ou com pulso de arranque na fila) e comando chamaria script -> STOP
+        if call_script and (self._is_moving or self._tx_queued):
             await self.async_stop_cover()
             return
 
         # Se há sensor para a direção e o comando chama script: aguardar sensor
-        if call_script and ((direction == "open" and self._open_sensor) or (direction == "close" and self._close_sensor)):
-            if self._script_configured:
-                await self.hass.services.async_call(
-                    "script", "turn_on", {"entity_id": self._script_configured}, blocking=False
-                )
-                self._script_running = self._script_configured
-            self._pending_start = {"direction": direction, "target": target_position}
+        sensor = self._settings.open_sensor if direction == "open" else self._settings.close_sensor
+        if call_script and sensor:
+            sent = None
+            if self._settings.script:
+                sent = self._tx_future = self._transmit(self._settings.script)
+            self._set_pending(direction, target_position, sent)
             self.async_write_ha_state()
             return
 
+        # Posicionamento sem sensor: pulso para a fila, movimento conta a partir do envio
+        # mais a latência RF
+        if call_script and target_position is not None and self._settings.script:
+            sent = self._transmit(self._settings.script)
+            if self._next_action == direction:
+                self._begin_when_sent(sent, direction, target_position)
+            else:
+                self._reverse_when_sent(sent, direction, target_position)
+            return
+
         # Caso contrário, arrancar já
-        await self._begin_movement(direction, target_position)
+        self._begin_movement(direction, target_position)
+
+    @callback
+    def _begin_movement(
+        self,
+        direction: str,
+        target_position: int | None,
+        start_at: float | None = None,
+        physical: bool = False,
+        ramp: float | None = None,
+    ):
+        """Inicia efetivamente o movimento (simulação) e devolve de imediato.
+
+        ``start_at`` (loop.time()) permite contar o movimento a partir do
+        instante em que o motor arranca de facto; ``physical`` indica que o
+        motor se move mesmo, pelo que um alvo intermédio exige pulso de paragem.
+        ``ramp`` substitui a rampa de arranque calculada (ex.: movimento retomado).
+        A transição é feita já, de forma síncrona; a conclusão é acompanhada
+        por uma única tarefa de fundo por entidade, que substitui a anterior.
+        """
+        if target_position is None:
+            target_position = 100 if direction == "open" else 0
 
-    async def _begin_movement(self, direction: str, target_position: int | None):
-        """Inicia efetivamente o movimento (simulação)."""
+        # Posição = segmento avaliado no relógio; o agendador partilhado só
+        # acorda esta cover para refrescar o UI e no instante de chegada
+        stats = self._stats
+        if self._is_moving:
+            stats.overlap_conflicts += 1
+            stats.writes_per_movement.record(self._movement_writes)
+        stats.movements += 1
+        self._movement_writes = 0
+        if self._command_at is not None:
+            started = max(start_at or 0.0, self.hass.loop.time())
+            stats.command_to_start.record(started - self._command_at)
+            self._command_at = None
+
+        # A rampa de arranque só se aplica a um motor que parte do repouso
+        if ramp is None:
+            ramp = self._ramp(direction) if physical and not self._is_moving else 0.0
+        self._settle_position()
+        self._release_motion()
+        self._cancel_stop_timer()
+        self._stop_future = None
+        self._calib_run = None
+        loop = self.hass.loop
+        now = loop.time()
+        motion = MotionSegment(
+            direction,
+            now if start_at is None else start_at,
+            self._position,
+            float(target_position),
+            self._duration(direction),
+            ramp,
+        )
+        self._motion = motion
+        self._physical = physical
         self._is_moving = True
-        self._state = STATE_OPENING if direction == "open" else STATE_CLOSING
-        self._next_action = "stop"
-        self.async_write_ha_state()
+        self._transition(EVENT_START_OPEN if direction == "open" else EVENT_START_CLOSE)
+        self._arm_stop_timer()
+        done = self._motion_done = loop.create_future()
+        self._scheduler.schedule(self, self._next_deadline(now, motion))
 
-        full = max(1, int(self._open_duration if direction == "open" else self._close_duration))
-        step = 0.5
-        delta = 100.0 / (full / step)
-        if direction == "close":
-            delta = -delta
+        previous = self._motion_task
+        self._motion_task = self.hass.async_create_background_task(
+            self._async_track_motion(direction, done), f"{DOMAIN} motion {self.entity_id}"
+        )
+        if previous is not None and not previous.done():
+            previous.cancel()
 
-        target = target_position if target_position is not None else (100 if direction == "open" else 0)
+        self.async_write_ha_state()
+        self._async_save()  # segmento em curso, para retomar após um reinício abrupto
 
+    async def _async_track_motion(self, direction: str, done: asyncio.Future):
+        """Aguarda o fim do movimento (chegada ou paragem) e finaliza o estado.
+
+        Cancelada quando substituída por um novo movimento ou quando a entidade
+        é removida; nesse caso não há nada a finalizar.
+        """
         try:
-            while self._is_moving:
-                self._position = max(0.0, min(100.0, self._position + delta))
-                if (direction == "open" and self._position >= target) or (direction == "close" and self._position <= target):
-                    break
-                self.async_write_ha_state()
-                await asyncio.sleep(step)
-        finally:
+            await done
+            # Se entretanto começou um novo movimento, este não finaliza
+            if self._motion_done is not None:
+                return
+
+            # Já parado por _stop_motion, que fez a transição e escreveu o estado
+            if not self._is_moving:
+                return
+            self._settle_position()
+            self._cancel_stop_timer()
             self._is_moving = False
             self._script_running = None
+            self._transition(EVENT_ARRIVE_OPEN if direction == "open" else EVENT_ARRIVE_CLOSE)
+            self.async_write_ha_state()
+            self._async_save()
+            self._stats.finish_movement(self._movement_writes + 1)
+        finally:
+            if self._motion_task is asyncio.current_task():
+                self._motion_task = None
 
-            tol = self._tol
-            if self._position <= tol:
-                self._state = STATE_CLOSED
-                self._next_action = "open"
-            elif self._position >= 100.0 - tol:
-                self._state = STATE_OPEN
-                self._next_action = "close"
-            else:
-                self._state = STATE_OPEN if self._position >= 50 else STATE_CLOSED
-                self._next_action = "close" if direction == "open" else "open"
+    def _retarget(self, target: float):
+        """Muda o alvo do segmento ativo sem interromper o movimento."""
+        now = self.hass.loop.time()
+        old = self._motion
+        ramp_left = max(0.0, old.start + old.ramp - max(now, old.start))
+        self._motion = MotionSegment(
+            old.direction,
+            max(now, old.start),
+            old.position_at(now),
+            target,
+            self._duration(old.direction),
+            ramp_left,
+        )
+        self._arm_stop_timer()
+        self._scheduler.schedule(self, self._next_deadline(now, self._motion))
+        self._publish_motion()
+        self._async_save()
+
+    def _duration(self, direction: str) -> float:
+        """Tempo de viagem completa: aprendido pelos sensores ou o configurado."""
+        nominal = self._nominal(direction)
+        if self._settings.auto_calibrate:
+            return self._calibration.duration(direction, nominal)
+        return float(nominal)
 
+    def _nominal(self, direction: str) -> float:
+        settings = self._settings
+        return settings.open_duration if direction == "open" else settings.close_duration
+
+    def _ramp(self, direction: str) -> float:
+        return self._calibration.ramp(direction) if self._settings.auto_calibrate else 0.0
+
+    def _calibration_start(self, direction: str):
+        """Flanco "on" do sensor: início de uma viagem mensurável (requer os dois sensores)."""
+        settings = self._settings
+        if not (settings.auto_calibrate and settings.open_sensor and settings.close_sensor):
+            return
+        motion = self._motion
+        # Só viagens até ao fim de curso: um alvo intermédio termina com pulso de paragem
+        if motion is not None and motion.direction == direction and motion.target in (0.0, 100.0):
+            self._calib_run = (direction, self.hass.loop.time(), motion.origin)
+
+    def _calibration_end(self, direction: str):
+        """Flanco "off" do sensor: fim de curso atingido, regista a amostra."""
+        run = self._calib_run
+        if run is None or run[0] != direction:
+            return
+        self._calib_run = None
+        _, started, origin = run
+        distance = 100.0 - origin if direction == "open" else origin
+        elapsed = self.hass.loop.time() - started
+        if self._calibration.add_sample(direction, distance, elapsed, self._nominal(direction)):
+            _LOGGER.debug(
+                "%s: amostra de %s aceite (%.0f%%); tempo aprendido %.1f s",
+                self.entity_id, direction, distance, self._duration(direction),
+            )
             self.async_write_ha_state()
+            self._async_save()
+
+    @property
+    def _latency(self) -> float:
+        """Latência RF/atuação em segundos: configurada ou, na falta, medida."""
+        if self._settings.rf_latency is not None:
+            return self._settings.rf_latency
+        return self._latency_measured or 0.0
+
+    def _record_latency(self):
+        """Amostra script -> confirmação do sensor (média móvel exponencial)."""
+        sent_at = self._script_sent_at
+        self._script_sent_at = None
+        if sent_at is None:
+            return
+        sample = self.hass.loop.time() - sent_at
+        if sample < 0 or sample > LATENCY_MAX:
+            return
+        self._stats.script_to_sensor.record(sample)
+        prev = self._latency_measured
+        self._latency_measured = sample if prev is None else prev + LATENCY_ALPHA * (sample - prev)
+
+    @callback
+    def _transmit(self, entity_id: str, priority: int = PRIORITY_MOVE) -> asyncio.Future:
+        """Põe o pulso na fila do transmissor do grupo; resolve com o instante real de envio."""
+        self._script_running = entity_id
+        self._script_sent_at = None
+        future = async_get_transmitter(self.hass, self._settings.tx_group).async_enqueue(
+            entity_id, priority, self._settings.tx_gap, self._settings.tx_repeat
+        )
+        future.add_done_callback(self._on_script_sent)
+        return future
+
+    @callback
+    def _on_script_sent(self, future: asyncio.Future):
+        if future.cancelled():
+            return
+        self._script_sent_at = future.result()
+
+    @callback
+    def _begin_when_sent(self, future: asyncio.Future, direction: str, target_position: int | None):
+        """O movimento simulado começa quando o pulso sai de facto, não quando entra na fila."""
+        self._cancel_tx()
+        self._tx_future = future
+        future.add_done_callback(functools.partial(self._on_start_sent, direction, target_position))
+
+    @callback
+    def _on_start_sent(self, direction: str, target_position: int | None, future: asyncio.Future):
+        if self._tx_future is not future:
+            return  # substituído ou cancelado por outro comando
+        self._tx_future = None
+        if future.cancelled():
+            self._script_running = None
+            self.async_write_ha_state()
+            return
+        start_at = future.result() + self._latency
+        self._begin_movement(direction, target_position, start_at=start_at, physical=True)
+
+    @callback
+    def _reverse_when_sent(self, future: asyncio.Future, direction: str, target_position: int):
+        """Botão único com a próxima ação no sentido oposto: segue o ciclo completo.
+
+        O primeiro pulso arranca o motor ao contrário; quando sai, seguem para
+        a fila a paragem (com prioridade, sai primeiro) e um novo arranque,
+        agora no sentido pedido.
+        """
+        self._cancel_tx()
+        self._tx_future = future
+        future.add_done_callback(
+            functools.partial(self._on_reverse_sent, direction, target_position)
+        )
+
+    @callback
+    def _on_reverse_sent(self, direction: str, target_position: int, future: asyncio.Future):
+        if self._tx_future is not future:
+            return
+        self._tx_future = None
+        if future.cancelled():
+            self._script_running = None
+            self.async_write_ha_state()
+            return
+        reverse = "close" if direction == "open" else "open"
+        self._begin_movement(reverse, None, start_at=future.result() + self._latency, physical=True)
+        self._stop_future = self._enqueue_stop()
+        self._restart_after_stop(direction, target_position)
+
+    @callback
+    def _reverse_moving(self, direction: str, target_position: int):
+        """set_position ao contrário com o motor em movimento: parar e voltar a arrancar.
+
+        O segmento atual segue até a paragem sair de facto (mais a latência RF);
+        uma paragem já na fila ou enviada para o alvo anterior é reaproveitada.
+        """
+        self._cancel_stop_timer()
+        if self._stop_future is None:
+            self._stop_future = self._enqueue_stop()
+        self._last_trigger = f"user_set_position_{target_position}"
+        self._restart_after_stop(direction, target_position)
+        self.async_write_ha_state()
+
+    @callback
+    def _restart_after_stop(self, direction: str, target_position: int):
+        """Arranque no sentido pedido, na fila atrás da paragem (que tem prioridade)."""
+        start = self._transmit(self._settings.script)
+        self._stop_future.add_done_callback(functools.partial(self._on_reverse_stopped, start))
+        sensor = self._settings.open_sensor if direction == "open" else self._settings.close_sensor
+        if sensor:
+            self._cancel_tx()
+            self._tx_future = start
+            self._set_pending(direction, target_position, start)
+        else:
+            self._begin_when_sent(start, direction, target_position)
+
+    @callback
+    def _on_reverse_stopped(self, start: asyncio.Future, future: asyncio.Future):
+        """Paragem antes da inversão: o segmento passa a terminar onde o motor pára."""
+        if future.cancelled() or self._tx_future is not start or not self._is_moving:
+            return
+        if self._motion is not None:
+            self._end_motion_at(future.result() + self._latency)
+
+    @callback
+    def _stop_when_sent(self, future: asyncio.Future):
+        """A simulação pára quando o pulso de paragem sai de facto (mais a latência RF)."""
+        self._cancel_tx()
+        self._tx_future = future
+        future.add_done_callback(self._on_stop_sent)
+
+    @callback
+    def _on_stop_sent(self, future: asyncio.Future):
+        if self._tx_future is not future:
+            return
+        self._tx_future = None
+        if future.cancelled() or not self._is_moving:
+            return
+        self._cancel_stop_timer()
+        when = future.result() + self._latency
+        if when <= self.hass.loop.time():
+            self._stop_motion("service")
+        else:
+            self._stop_timer = self.hass.loop.call_at(when, self._stop_motion, "service")
+
+    @callback
+    def _set_pending(
+        self,
+        direction: str,
+        target_position: int | None,
+        sent: asyncio.Future | None,
+        attempt: int = 0,
+    ):
+        """Arma o arranque pendente; o prazo de confirmação conta desde o envio real do pulso."""
+        self._clear_pending()
+        pending = self._pending_start = {
+            "direction": direction, "target": target_position, "attempt": attempt
+        }
+        if self._settings.confirm_timeout <= 0:
+            return
+        if sent is None:
+            self._arm_pending_timer(pending)
+        else:
+            sent.add_done_callback(lambda fut: self._arm_pending_timer(pending))
+
+    @callback
+    def _arm_pending_timer(self, pending: dict[str, Any]):
+        if self._pending_start is not pending:
+            return  # já confirmado, cancelado ou substituído
+        timeout = self._settings.confirm_timeout * (2 ** pending["attempt"])
+        self._pending_timer = self.hass.loop.call_later(timeout, self._on_pending_timeout, pending)
+
+    def _clear_pending(self):
+        self._pending_start = None
+        if self._pending_timer is not None:
+            self._pending_timer.cancel()
+            self._pending_timer = None
+
+    @callback
+    def _on_pending_timeout(self, pending: dict[str, Any]):
+        """Sensor não confirmou a tempo: reenvia com recuo exponencial ou desiste."""
+        self._pending_timer = None
+        if self._pending_start is not pending:
+            return
+        self._stats.pending_expired += 1
+        attempt = pending["attempt"] + 1
+        if attempt <= self._settings.confirm_retries and self._settings.script:
+            _LOGGER.debug(
+                "%s: sem confirmação do sensor, reenvio %d/%d",
+                self.entity_id, attempt, self._settings.confirm_retries,
+            )
+            sent = self._tx_future = self._transmit(self._settings.script)
+            self._set_pending(pending["direction"], pending["target"], sent, attempt)
+            return
+
+        _LOGGER.warning(
+            "%s: o sensor de %s não confirmou o arranque após %d tentativa(s)",
+            self.entity_id, pending["direction"], attempt,
+        )
+        self._stats.pending_abandoned += 1
+        self._stats.notify()
+        self._clear_pending()
+        self._command_at = None
+        self._script_running = None
+        self._last_trigger = "pending_timeout"
+        self.hass.bus.async_fire(
+            EVENT_PENDING_TIMEOUT,
+            {"entity_id": self.entity_id, "direction": pending["direction"], "attempts": attempt},
+        )
+        self.async_write_ha_state()
+
+    @property
+    def _tx_queued(self) -> bool:
+        return self._tx_future is not None and not self._tx_future.done()
+
+    def _cancel_tx(self):
+        future = self._tx_future
+        self._tx_future = None
+        if future is not None and not future.done():
+            future.cancel()
+
+    def _arm_stop_timer(self):
+        """Agenda o pulso de paragem para o alvo intermédio, antecipado pela latência."""
+        self._cancel_stop_timer()
+        motion = self._motion
+        if motion is None or not self._physical or not self._settings.stop_script:
+            return
+        if motion.target <= 0.0 or motion.target >= 100.0:
+            return  # extremos: o motor pára sozinho no fim de curso
+        when = max(self.hass.loop.time(), motion.eta - self._latency)
+        self._stop_timer = self.hass.loop.call_at(when, self._fire_stop)
+
+    def _cancel_stop_timer(self):
+        if self._stop_timer is not None:
+            self._stop_timer.cancel()
+            self._stop_timer = None
+
+    @callback
+    def _fire_stop(self):
+        self._stop_timer = None
+        stop = self._stop_future = self._enqueue_stop()
+        motion = self._motion
+        if motion is None:
+            return
+        # Até o pulso sair o motor não pára: o segmento segue para o fim de curso e é
+        # cortado no instante real de envio mais a latência RF (fila ocupada = atraso)
+        end = 100.0 if motion.direction == "open" else 0.0
+        duration = 100.0 / abs(motion.velocity)
+        self._motion = MotionSegment(
+            motion.direction, motion.start, motion.origin, end, duration, motion.ramp
+        )
+        stop.add_done_callback(functools.partial(self._on_target_stop_sent, self._motion))
+
+    @callback
+    def _on_target_stop_sent(self, motion: MotionSegment, future: asyncio.Future):
+        if future.cancelled() or self._motion is not motion or not self._is_moving:
+            return
+        self._end_motion_at(future.result() + self._latency)
+
+    def _end_motion_at(self, when: float):
+        """Corta o segmento ativo no instante em que o motor pára de facto."""
+        motion = self._motion
+        position = motion.position_at(when)
+        duration = 100.0 / abs(motion.velocity)
+        self._motion = MotionSegment(
+            motion.direction, motion.start, motion.origin, position, duration, motion.ramp
+        )
+        self._scheduler.schedule(self, self._next_deadline(self.hass.loop.time(), self._motion))
+        self._publish_motion()
+
+    def _enqueue_stop(self) -> asyncio.Future:
+        # Paragem com prioridade sobre abrir/fechar na fila do transmissor
+        settings = self._settings
+        return async_get_transmitter(self.hass, settings.tx_group).async_enqueue(
+            settings.stop_script, PRIORITY_STOP, settings.tx_gap, settings.tx_repeat
+        )
+
+    @property
+    def _scheduler(self) -> MotionScheduler:
+        return self.hass.data[DOMAIN]["scheduler"]
+
+    @callback
+    def _motion_tick(self, now: float) -> float | None:
+        """Chamado pelo agendador; devolve o próximo prazo ou None."""
+        motion = self._motion
+        if motion is None or not self._is_moving:
+            self._release_motion()
+            return None
+        # Um alvo que cai dentro da folga do agendador conta já como chegada (a posição
+        # fica no alvo): de outro modo seria uma escrita e um despertar extra só para a fechar
+        if motion.reached(now + self._scheduler.slack):
+            self._position = motion.target
+            self._motion = None
+            self._release_motion()
+            return None
+        # Os ticks do agendador já seguem o intervalo configurado
+        self.async_write_ha_state()
+        return self._next_deadline(now, motion)
+
+    def _next_deadline(self, now: float, motion: MotionSegment) -> float:
+        """Próximo despertar: refresco do UI (se ativo) ou chegada ao alvo."""
+        if self._settings.update_interval <= 0:
+            return motion.eta
+        return min(now + self._settings.update_interval, motion.eta)
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        # Uma escrita completa substitui qualquer escrita de progresso pendente
+        if self._write_handle is not None:
+            self._write_handle.cancel()
+            self._write_handle = None
+        self._last_write = self.hass.loop.time()
+        if self._is_moving:
+            self._movement_writes += 1
+        super().async_write_ha_state()
+        self._publish_motion()
+        for group in self._groups:
+            group.async_member_updated(self)
+
+    @callback
+    def _publish_motion(self) -> None:
+        """Subscritores do frontend só recebem o segmento quando ele muda, não a cada refresco."""
+        key = (self._motion, None) if self._is_moving else (None, self._position)
+        if key != self._motion_key:
+            self._motion_key = key
+            self.hass.data[DOMAIN]["motion_feed"].publish(self.entity_id, self)
+
+    @callback
+    def _async_write_progress(self) -> None:
+        """Escrita de progresso: no máximo uma por janela; as restantes são agregadas."""
+        interval = self._settings.update_interval
+        if interval <= 0:
+            return
+        due = self._last_write + interval
+        if self.hass.loop.time() >= due:
+            self.async_write_ha_state()
+        elif self._write_handle is None:
+            self._write_handle = self.hass.loop.call_at(due, self._flush_progress)
+
+    @callback
+    def _flush_progress(self) -> None:
+        self._write_handle = None
+        self.async_write_ha_state()
+
+    def _release_motion(self):
+        """Acorda o ciclo de movimento em espera (chegada, paragem ou substituição)."""
+        done = self._motion_done
+        if done is not None:
+            self._motion_done = None
+            self._scheduler.cancel(self)
+            if not done.done():
+                done.set_result(None)
 
     # Helpers / getters
     @property
@@ -284,26 +1035,115 @@ class CoverRFSyncEntity(CoverEntity):
 
     @property
     def current_cover_position(self) -> int | None:
-        return int(round(self._position))
+        return int(round(self._live_position()))
 
     @property
     def extra_state_attributes(self) -> dict:
+        # Reconstruído só quando uma das entradas muda (durante o movimento nunca)
+        key = (
+            self._is_moving, self._next_action, self._settings.script, self._script_running,
+            self._last_trigger, self._calibration, self._calibration.revision,
+        )
+        if key != self._attrs_key:
+            self._attrs_key = key
+            self._attrs = {
+                ATTR_IS_MOVING: self._is_moving,
+                ATTR_NEXT_ACTION: self._next_action,
+                ATTR_SCRIPT_CONFIGURED: self._settings.script,
+                ATTR_SCRIPT_RUNNING: self._script_running,
+                ATTR_LAST_TRIGGER: self._last_trigger,
+                ATTR_LEARNED_OPEN: self._learned_travel("open"),
+                ATTR_LEARNED_CLOSE: self._learned_travel("close"),
+            }
+        return self._attrs
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Instantâneo do estado interno para o download de diagnóstico."""
+        motion = self._motion
         return {
-            ATTR_IS_MOVING: self._is_moving,
-            ATTR_NEXT_ACTION: self._next_action,
-            ATTR_SCRIPT_CONFIGURED: self._script_configured,
-            ATTR_SCRIPT_RUNNING: self._script_running,
-            ATTR_LAST_TRIGGER: self._last_trigger,
+            "entity_id": self.entity_id,
+            "position": round(self._live_position(), 2),
+            "state": self._state,
+            "next_action": self._next_action,
+            "is_moving": self._is_moving,
+            "pending_start": self._pending_start,
+            "motion": None if motion is None else {
+                "direction": motion.direction,
+                "origin": round(motion.origin, 2),
+                "target": motion.target,
+                "velocity": round(motion.velocity, 4),
+                "ramp": motion.ramp,
+                "eta_in": round(motion.eta - self.hass.loop.time(), 2),
+            },
+            "durations": {"open": self._duration("open"), "close": self._duration("close")},
+            "latency": {
+                "configured": self._settings.rf_latency, "measured": self._latency_measured
+            },
+            "calibration": self._calibration.as_dict(),
+            "tx_group": self._settings.tx_group,
+            "rf_event": {
+                "entity": self._settings.event_entity,
+                "event_type": self._settings.event_type,
+                "match": (
+                    self._settings.event_entity_match
+                    if self._settings.event_entity
+                    else self._settings.event_match
+                ),
+            },
         }
 
-    def _apply_next_action_from_position(self):
-        tol = self._tol
-        if self._position <= tol:
-            self._state = STATE_CLOSED
-            self._next_action = "open"
-        elif self._position >= 100.0 - tol:
-            self._state = STATE_OPEN
-            self._next_action = "close"
-        else:
-            self._state = STATE_OPEN if self._position >= 50 else STATE_CLOSED
-            self._next_action = "close" if self._position >= 50 else "open"
+    def motion_snapshot(self) -> dict[str, Any]:
+        """Segmento atual em relógio de parede, para o frontend interpolar localmente."""
+        motion = self._motion
+        if motion is None or not self._is_moving:
+            return {
+                "entity_id": self.entity_id, "moving": False, "position": round(self._position, 2)
+            }
+        wall = time.time() - self.hass.loop.time()
+        return {
+            "entity_id": self.entity_id,
+            "moving": True,
+            "direction": motion.direction,
+            "origin": round(motion.origin, 2),
+            "target": motion.target,
+            "velocity": round(motion.velocity, 4),
+            "start": motion.start + motion.ramp + wall,  # a posição começa a variar aqui
+            "eta": motion.eta + wall,
+        }
+
+    def group_record(self) -> tuple[float, bool, str, bool]:
+        """(posição, fechado, próxima ação, ocupado) para o agregado dos grupos."""
+        return (
+            self._live_position(), self._state == STATE_CLOSED, self._next_action,
+            self._is_moving or self._pending_start is not None or self._tx_queued,
+        )
+
+    def is_heading(self, direction: str) -> bool:
+        """Já a caminho de ``direction`` (em movimento ou à espera do sensor) ou parada
+        nesse extremo."""
+        pending = self._pending_start
+        if pending is not None:
+            return pending.get("direction") == direction
+        if self._tx_queued:
+            return True  # pulso de arranque ainda na fila: outro comando seria uma paragem
+        if self._is_moving:
+            return self._motion is not None and self._motion.direction == direction
+        zone = position_zone(self._position, self._settings.tolerance)
+        return zone == (ZONE_OPEN if direction == "open" else ZONE_CLOSED)
+
+    def _learned_travel(self, direction: str) -> float | None:
+        if not self._calibration.learned(direction):
+            return None
+        calibration = self._calibration
+        return round(calibration.duration(direction, 0) + calibration.ramp(direction), 1)
+
+    def _live_position(self) -> float:
+        if self._motion is not None:
+            return self._motion.position_at(self.hass.loop.time())
+        return self._position
+
+    def _settle_position(self):
+        """Fixa a posição verdadeira no instante atual e termina o segmento."""
+        if self._motion is not None:
+            self._position = max(0.0, min(100.0, self._motion.position_at(self.hass.loop.time())))
+            self._motion = None
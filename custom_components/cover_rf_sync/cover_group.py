@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from homeassistant.components.cover import CoverEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import HomeAssistant, callback
+
+from .const import ATTR_IS_MOVING, ATTR_NEXT_ACTION, CONF_MEMBERS, DOMAIN
+from .state import FEATURES
+
+# Registo de cada membro: (posição, fechado, próxima ação, ocupado)
+_Record = tuple[float, bool, str, bool]
+
+
+class CoverRFSyncGroup(CoverEntity):
+    """Grupo nativo de covers da integração, comandadas num só passo.
+
+    Cada comando é entregue às covers membro (que mantêm arranque pendente,
+    próxima ação e fila RF próprios) no mesmo ciclo do loop, pelo que os
+    pulsos de membros com o mesmo script se fundem numa só trama (ver
+    transmit.py). Membros já no destino ou a caminho dele são saltados.
+
+    O agregado é mantido por deltas: cada membro notifica o grupo quando
+    escreve o seu estado e o grupo ajusta somas e contagens só com a
+    diferença; as escritas do grupo são agregadas numa por ciclo.
+    """
+
+    _attr_should_poll = False
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry):
+        self.hass = hass
+        self.entry = entry
+        self._attr_unique_id = f"{entry.entry_id}_group"
+        self._attr_name = entry.title or "Grupo"
+        self._member_ids: tuple[str, ...] = tuple(
+            entry.options.get(CONF_MEMBERS) or entry.data.get(CONF_MEMBERS) or ()
+        )
+        self._members: dict[str, Any] = {}  # entity_id -> cover ligada
+        self._records: dict[str, _Record] = {}
+
+        # Agregado incremental
+        self._position_sum = 0.0
+        self._closed = 0
+        self._busy = 0   # membros em movimento ou à espera do sensor
+        self._opens = 0  # membros parados cuja próxima ação é abrir
+        self._next_action = "open"
+        self._attr_supported_features = FEATURES["open"]
+        self._write_handle: asyncio.Handle | None = None
+
+    async def async_added_to_hass(self):
+        await super().async_added_to_hass()
+        self.hass.data[DOMAIN]["groups"].append(self)
+        entities = self.hass.data[DOMAIN]["entities"]
+        for entity_id in self._member_ids:
+            if entity_id in entities:
+                self.async_attach(entities[entity_id])
+
+    async def async_will_remove_from_hass(self):
+        groups = self.hass.data[DOMAIN]["groups"]
+        if self in groups:
+            groups.remove(self)
+        for cover in tuple(self._members.values()):
+            self.async_detach(cover)
+        if self._write_handle is not None:
+            self._write_handle.cancel()
+            self._write_handle = None
+
+    # Membros
+    @callback
+    def async_attach(self, cover) -> None:
+        """Liga uma cover membro (chamado também pela cover quando é adicionada)."""
+        if cover.entity_id not in self._member_ids or cover.entity_id in self._members:
+            return
+        self._members[cover.entity_id] = cover
+        cover._groups.append(self)
+        self.async_member_updated(cover)
+
+    @callback
+    def async_detach(self, cover) -> None:
+        if self._members.get(cover.entity_id) is not cover:
+            return
+        del self._members[cover.entity_id]
+        if self in cover._groups:
+            cover._groups.remove(self)
+        self._apply(cover.entity_id, None)
+
+    @callback
+    def async_member_updated(self, cover) -> None:
+        self._apply(cover.entity_id, cover.group_record())
+
+    def _apply(self, entity_id: str, record: _Record | None) -> None:
+        old = self._records.get(entity_id)
+        if old == record:
+            return
+        if old is not None:
+            self._account(old, -1)
+            del self._records[entity_id]
+        if record is not None:
+            self._account(record, 1)
+            self._records[entity_id] = record
+        if self._busy:
+            next_action = "stop"
+        else:
+            next_action = "open" if 2 * self._opens >= len(self._records) else "close"
+        if next_action != self._next_action:
+            self._next_action = next_action
+            self._attr_supported_features = FEATURES[next_action]
+        # Várias covers escrevem no mesmo tick (agendador partilhado): uma só escrita do grupo
+        if self._write_handle is None and self.entity_id:
+            self._write_handle = self.hass.loop.call_soon(self._flush)
+
+    def _account(self, record: _Record, sign: int) -> None:
+        position, closed, next_action, busy = record
+        self._position_sum += sign * position
+        self._closed += sign * closed
+        self._busy += sign * busy
+        self._opens += sign * (not busy and next_action == "open")
+
+    @callback
+    def _flush(self) -> None:
+        self._write_handle = None
+        self.async_write_ha_state()
+
+    # Comandos: todos os membros no mesmo ciclo, para fundir pulsos e filas
+    async def async_open_cover(self, **kwargs):
+        await self._async_move("open")
+
+    async def async_close_cover(self, **kwargs):
+        await self._async_move("close")
+
+    async def _async_move(self, direction: str):
+        targets = [cover for cover in self._members.values() if not cover.is_heading(direction)]
+        if direction == "open":
+            await asyncio.gather(*(cover.async_open_cover() for cover in targets))
+        else:
+            await asyncio.gather(*(cover.async_close_cover() for cover in targets))
+
+    async def async_set_cover_position(self, **kwargs):
+        position = int(kwargs["position"])
+        await asyncio.gather(*(
+            cover.async_set_cover_position(position=position)
+            for cover in self._members.values()
+            if cover.current_cover_position != position
+        ))
+
+    async def async_stop_cover(self, **kwargs):
+        await asyncio.gather(*(
+            cover.async_stop_cover()
+            for entity_id, cover in self._members.items()
+            if self._records[entity_id][3]
+        ))
+
+    # Estado
+    @property
+    def available(self) -> bool:
+        return bool(self._records)
+
+    @property
+    def current_cover_position(self) -> int | None:
+        if not self._records:
+            return None
+        return int(round(self._position_sum / len(self._records)))
+
+    @property
+    def is_closed(self) -> bool | None:
+        if not self._records:
+            return None
+        return self._closed == len(self._records)
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        return {
+            ATTR_ENTITY_ID: list(self._member_ids),
+            ATTR_NEXT_ACTION: self._next_action,
+            ATTR_IS_MOVING: self._busy > 0,
+        }
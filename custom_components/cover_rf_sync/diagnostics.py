@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Contadores, histogramas de latência e estado interno da cover da entrada."""
+    domain_data = hass.data.get(DOMAIN, {})
+    stats = domain_data.get("stats", {}).get(entry.entry_id)
+    cover = next(
+        (e for e in domain_data.get("entities", {}).values() if e.entry.entry_id == entry.entry_id),
+        None,
+    )
+    transmitters = {
+        group: {
+            "queued": tx.queued, "frames_sent": tx.frames_sent, "frames_merged": tx.frames_merged
+        }
+        for group, tx in domain_data.get("transmitters", {}).items()
+    }
+    dispatcher = domain_data.get("sensors")
+    feed = domain_data.get("motion_feed")
+    return {
+        "entry": {"title": entry.title, "data": dict(entry.data), "options": dict(entry.options)},
+        "stats": stats.as_dict() if stats is not None else None,
+        "cover": cover.diagnostics() if cover is not None else None,
+        "transmitters": transmitters,
+        "sensor_edges": None if dispatcher is None else {
+            "dispatched": dispatcher.dispatched,
+            "suppressed": dispatcher.suppressed,
+        },
+        "motion_segments_published": None if feed is None else feed.published,
+    }
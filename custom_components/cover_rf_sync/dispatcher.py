@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+from typing import Any, Callable
+
+from homeassistant.const import EVENT_STATE_CHANGED, STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import HomeAssistant, callback
+
+# Estados que contam como "ligado" para o sensor de cada direção (comparação em minúsculas)
+TRUTHY: dict[str, frozenset[str]] = {
+    "open": frozenset({"on", "true", "opening", "open"}),
+    "close": frozenset({"on", "true", "closing", "closed"}),
+}
+
+
+class _Binding:
+    """Ligação sensor -> cover numa direção, com o seu estado anti-ressalto."""
+
+    __slots__ = ("cover", "direction", "debounce", "on", "timer")
+
+    def __init__(self, cover: Any, direction: str, debounce: float, on: bool):
+        self.cover = cover
+        self.direction = direction
+        self.debounce = debounce
+        self.on = on  # último valor lógico entregue à cover
+        self.timer: asyncio.TimerHandle | None = None  # fim da janela de retenção
+
+
+def parse_event_filter(text: str | None, default_key: str) -> dict[str, str]:
+    """``"code=1234, channel=2"`` -> ``{"code": "1234", "channel": "2"}``.
+
+    Um valor solto (sem ``=``) usa ``default_key``.
+    """
+    match: dict[str, str] = {}
+    for part in (text or "").split(","):
+        key, sep, value = part.partition("=")
+        if not sep:
+            key, value = default_key, key
+        key, value = key.strip(), value.strip()
+        if key and value:
+            match[key] = value
+    return match
+
+
+class _PressBinding:
+    """Ligação de um comando RF (evento) a uma cover, com retenção após cada toque."""
+
+    __slots__ = ("cover", "match", "holdoff", "until")
+
+    def __init__(self, cover: Any, match: tuple[tuple[str, str], ...], holdoff: float):
+        self.cover = cover
+        self.match = match
+        self.holdoff = holdoff
+        self.until = 0.0  # loop.time() até ao qual repetições da mesma trama são ignoradas
+
+    def matches(self, data: Any) -> bool:
+        for key, value in self.match:
+            if str(data.get(key)) != value:
+                return False
+        return True
+
+
+class SensorDispatcher:
+    """Subscrição única de ``state_changed`` para os sensores de todas as covers.
+
+    Mantém um índice ``sensor -> [ligação]`` (um sensor pode servir várias
+    covers). O filtro do barramento corre sem agendar nada e descarta eventos
+    de outras entidades e mudanças só de atributos; o despacho só chama a
+    cover quando o estado atravessa o flanco ligado/desligado da direção dela.
+    O custo por evento não depende do número de covers.
+
+    Anti-ressalto por ligação: o primeiro flanco é entregue de imediato
+    (flanco de ataque) e abre uma janela de retenção; flancos dentro da janela
+    são absorvidos e, no fim dela, se o estado final do sensor diferir do
+    último entregue, é entregue um único flanco de correção.
+
+    Também despacha toques de comandos RF para ``cover._handle_press()``:
+    entidades ``event`` (pela mesma subscrição de ``state_changed``) ou um
+    tipo de evento do barramento (uma subscrição por tipo), filtrados pelo
+    código/payload. Um recetor reporta a mesma trama várias vezes por toque,
+    pelo que cada ligação ignora repetições durante a sua retenção.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        self.hass = hass
+        self._index: dict[str, list[_Binding]] = {}
+        self._presses: dict[str, list[_PressBinding]] = {}  # entidade event -> ligações
+        self._events: dict[str, list[_PressBinding]] = {}   # tipo de evento -> ligações
+        self._event_unsubs: dict[str, Callable[[], None]] = {}
+        self._unsub: Callable[[], None] | None = None
+        self.dispatched = 0  # flancos entregues às covers
+        self.suppressed = 0  # flancos absorvidos pelas janelas anti-ressalto
+
+    @callback
+    def async_register(
+        self, sensor: str, cover: Any, direction: str, debounce: float = 0.0
+    ) -> Callable[[], None]:
+        """Liga ``sensor`` a ``cover._handle_sensor(direção, ligado)``; devolve o unsub."""
+        binding = _Binding(cover, direction, max(0.0, debounce), self._is_on(sensor, direction))
+        self._index.setdefault(sensor, []).append(binding)
+        self._subscribe_states()
+
+        @callback
+        def _remove() -> None:
+            if binding.timer is not None:
+                binding.timer.cancel()
+                binding.timer = None
+            bindings = self._index.get(sensor)
+            if bindings is None or binding not in bindings:
+                return
+            bindings.remove(binding)
+            if not bindings:
+                del self._index[sensor]
+            self._unsubscribe_states_if_idle()
+
+        return _remove
+
+    @callback
+    def async_register_event_entity(
+        self, entity_id: str, cover: Any, match: tuple[tuple[str, str], ...], holdoff: float
+    ) -> Callable[[], None]:
+        """Cada novo evento da entidade ``event`` que satisfaça ``match`` (atributos) é um toque."""
+        binding = _PressBinding(cover, match, max(0.0, holdoff))
+        self._presses.setdefault(entity_id, []).append(binding)
+        self._subscribe_states()
+
+        @callback
+        def _remove() -> None:
+            bindings = self._presses.get(entity_id)
+            if bindings is None or binding not in bindings:
+                return
+            bindings.remove(binding)
+            if not bindings:
+                del self._presses[entity_id]
+            self._unsubscribe_states_if_idle()
+
+        return _remove
+
+    @callback
+    def async_register_event_type(
+        self, event_type: str, cover: Any, match: tuple[tuple[str, str], ...], holdoff: float
+    ) -> Callable[[], None]:
+        """Cada evento ``event_type`` do barramento cujos dados satisfaçam ``match`` é um toque."""
+        binding = _PressBinding(cover, match, max(0.0, holdoff))
+        self._events.setdefault(event_type, []).append(binding)
+        if event_type not in self._event_unsubs:
+            self._event_unsubs[event_type] = self.hass.bus.async_listen(
+                event_type,
+                functools.partial(self._async_dispatch_event, event_type),
+                event_filter=functools.partial(self._async_event_filter, event_type),
+            )
+
+        @callback
+        def _remove() -> None:
+            bindings = self._events.get(event_type)
+            if bindings is None or binding not in bindings:
+                return
+            bindings.remove(binding)
+            if not bindings:
+                del self._events[event_type]
+                unsub = self._event_unsubs.pop(event_type, None)
+                if unsub is not None:
+                    unsub()
+
+        return _remove
+
+    def _subscribe_states(self) -> None:
+        if self._unsub is None:
+            self._unsub = self.hass.bus.async_listen(
+                EVENT_STATE_CHANGED, self._async_dispatch, event_filter=self._async_filter
+            )
+
+    def _unsubscribe_states_if_idle(self) -> None:
+        if not self._index and not self._presses and self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    def _is_on(self, sensor: str, direction: str) -> bool:
+        state = self.hass.states.get(sensor)
+        return state is not None and str(state.state).lower() in TRUTHY[direction]
+
+    @callback
+    def _async_filter(self, event_data: dict[str, Any]) -> bool:
+        entity_id = event_data["entity_id"]
+        if entity_id not in self._index and entity_id not in self._presses:
+            return False
+        new_state = event_data["new_state"]
+        if new_state is None:
+            return False
+        old_state = event_data["old_state"]
+        return old_state is None or old_state.state != new_state.state
+
+    @callback
+    def _async_dispatch(self, event) -> None:
+        data = event.data
+        sensor = data["entity_id"]
+        if sensor in self._presses:
+            self._dispatch_event_entity(data)
+        new = str(data["new_state"].state).lower()
+        for binding in tuple(self._index.get(sensor, ())):
+            on = new in TRUTHY[binding.direction]
+            if binding.timer is not None:
+                # Dentro da janela: absorvido, reconciliado no fim da retenção
+                self.suppressed += 1
+                continue
+            if on != binding.on:
+                self._deliver(sensor, binding, on)
+
+    def _dispatch_event_entity(self, data: dict[str, Any]) -> None:
+        # O estado de uma entidade event é o instante do último evento; sair de
+        # indisponível (arranque, reposição) não é um toque
+        old_state, new_state = data["old_state"], data["new_state"]
+        if old_state is None or old_state.state == STATE_UNAVAILABLE:
+            return
+        if new_state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            return
+        self._press(self._presses[data["entity_id"]], new_state.attributes)
+
+    @callback
+    def _async_event_filter(self, event_type: str, event_data: dict[str, Any]) -> bool:
+        for binding in self._events.get(event_type, ()):
+            if binding.matches(event_data):
+                return True
+        return False
+
+    @callback
+    def _async_dispatch_event(self, event_type: str, event) -> None:
+        self._press(self._events.get(event_type, ()), event.data)
+
+    def _press(self, bindings: list[_PressBinding], data: Any) -> None:
+        now = self.hass.loop.time()
+        for binding in tuple(bindings):
+            if not binding.matches(data):
+                continue
+            if now < binding.until:
+                self.suppressed += 1
+                continue
+            binding.until = now + binding.holdoff
+            self.dispatched += 1
+            binding.cover._handle_press()
+
+    @callback
+    def _deliver(self, sensor: str, binding: _Binding, on: bool) -> None:
+        binding.on = on
+        if binding.debounce:
+            binding.timer = self.hass.loop.call_later(
+                binding.debounce, self._release, sensor, binding
+            )
+        self.dispatched += 1
+        binding.cover._handle_sensor(binding.direction, on)
+
+    @callback
+    def _release(self, sensor: str, binding: _Binding) -> None:
+        binding.timer = None
+        on = self._is_on(sensor, binding.direction)
+        if on != binding.on:
+            self._deliver(sensor, binding, on)
+
+    @callback
+    def async_shutdown(self) -> None:
+        for bindings in self._index.values():
+            for binding in bindings:
+                if binding.timer is not None:
+                    binding.timer.cancel()
+                    binding.timer = None
+        for unsub in self._event_unsubs.values():
+            unsub()
+        self._event_unsubs.clear()
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
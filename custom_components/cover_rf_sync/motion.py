@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+from typing import Any, Callable
+
+from homeassistant.core import HomeAssistant, callback
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class MotionSegment:
+    """Segmento de movimento: posição avaliada a partir do relógio monotónico.
+
+    A posição não é acumulada em ticks; é calculada em cada leitura como
+    ``origin + velocity * (now - start - ramp)``, limitada ao alvo do segmento.
+    ``ramp`` é o tempo morto de arranque do motor (curva linear por troços).
+    """
+
+    __slots__ = ("direction", "start", "origin", "target", "velocity", "ramp")
+
+    def __init__(
+        self,
+        direction: str,
+        start: float,
+        origin: float,
+        target: float,
+        duration: float,
+        ramp: float = 0.0,
+    ):
+        self.direction = direction
+        self.start = start          # loop.time() no início do segmento
+        self.origin = origin        # posição (0..100) no início
+        self.ramp = max(0.0, ramp)  # s sem avanço no início (rampa de arranque)
+        # Alvo nunca fica "atrás" da origem (evita saltos de posição)
+        self.target = max(target, origin) if direction == "open" else min(target, origin)
+        full = max(1.0, float(duration))
+        speed = 100.0 / full        # %/s
+        self.velocity = speed if direction == "open" else -speed
+
+    def position_at(self, now: float) -> float:
+        pos = self.origin + self.velocity * max(0.0, now - self.start - self.ramp)
+        if self.velocity > 0:
+            return min(pos, self.target)
+        return max(pos, self.target)
+
+    @property
+    def eta(self) -> float:
+        """Instante (loop.time()) em que o alvo é atingido."""
+        return self.start + self.ramp + abs(self.target - self.origin) / abs(self.velocity)
+
+    def reached(self, now: float) -> bool:
+        return now >= self.eta
+
+
+class MotionScheduler:
+    """Agendador partilhado (um por integração) para todas as covers em movimento.
+
+    Mantém um heap de prazos (chegada ao alvo, refresco do UI) e um único
+    temporizador ``loop.call_at`` armado para o prazo mais próximo. Em cada
+    despertar processa de uma vez todas as covers cujo prazo caiu dentro da
+    janela ``slack``, para que as escritas de estado saiam no mesmo tick.
+    """
+
+    def __init__(self, hass: HomeAssistant, slack: float = 0.05):
+        self._loop = hass.loop
+        self._slack = slack
+        self._heap: list[tuple[float, int, Any]] = []
+        self._deadlines: dict[Any, tuple[float, int]] = {}
+        self._seq = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+        self._timer_at: float | None = None
+        self.wakeups = 0
+
+    @property
+    def active(self) -> int:
+        return len(self._deadlines)
+
+    @property
+    def slack(self) -> float:
+        """Janela (s) em que um prazo é tratado no despertar atual, antes da hora."""
+        return self._slack
+
+    @callback
+    def schedule(self, client, when: float) -> None:
+        """(Re)agenda o próximo prazo do cliente; substitui o anterior."""
+        entry = (when, next(self._seq))
+        self._deadlines[client] = entry
+        heapq.heappush(self._heap, (entry[0], entry[1], client))
+        if self._timer_at is None or when < self._timer_at:
+            self._arm()
+
+    @callback
+    def cancel(self, client) -> None:
+        # Remoção preguiçosa: a entrada no heap é descartada ao ser retirada
+        if self._deadlines.pop(client, None) is not None and not self._deadlines:
+            self._heap.clear()
+            self._disarm()
+
+    def _disarm(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = None
+        self._timer_at = None
+
+    def _arm(self) -> None:
+        heap = self._heap
+        while heap and self._deadlines.get(heap[0][2]) != (heap[0][0], heap[0][1]):
+            heapq.heappop(heap)
+        if not heap:
+            self._disarm()
+            return
+        when = heap[0][0]
+        if self._timer_at == when:
+            return
+        self._disarm()
+        self._timer_at = when
+        self._timer = self._loop.call_at(when, self._run)
+
+    @callback
+    def _run(self) -> None:
+        self._timer = None
+        self._timer_at = None
+        self.wakeups += 1
+        now = self._loop.time()
+        horizon = now + self._slack
+        heap = self._heap
+        due = []
+        while heap and heap[0][0] <= horizon:
+            when, seq, client = heapq.heappop(heap)
+            if self._deadlines.get(client) != (when, seq):
+                continue
+            del self._deadlines[client]
+            due.append(client)
+
+        for client in due:
+            try:
+                nxt = client._motion_tick(now)
+            except Exception:  # noqa: BLE001
+                _LOGGER.exception("Erro no tick de movimento de %s", client)
+                continue
+            if nxt is not None and client not in self._deadlines:
+                entry = (nxt, next(self._seq))
+                self._deadlines[client] = entry
+                heapq.heappush(heap, (entry[0], entry[1], client))
+
+        self._arm()
+
+    @callback
+    def async_shutdown(self) -> None:
+        self._disarm()
+        self._heap.clear()
+        self._deadlines.clear()
+
+
+class MotionFeed:
+    """Subscritores de segmentos de movimento (ver websocket.py).
+
+    Cada cover publica o seu segmento só quando ele muda (arranque, novo
+    alvo, paragem); entre publicações o cliente interpola a posição a
+    partir de início, velocidade e alvo. O instantâneo só é construído se
+    houver alguém a ouvir essa cover.
+    """
+
+    def __init__(self):
+        # entity_id -> ouvintes; None = todas as covers
+        self._listeners: dict[str | None, list[Callable[[dict[str, Any]], None]]] = {}
+        self.published = 0
+
+    @callback
+    def async_subscribe(
+        self, entity_ids: list[str] | None, listener: Callable[[dict[str, Any]], None]
+    ) -> Callable[[], None]:
+        keys = list(entity_ids) if entity_ids is not None else [None]
+        for key in keys:
+            self._listeners.setdefault(key, []).append(listener)
+
+        @callback
+        def _remove() -> None:
+            for key in keys:
+                listeners = self._listeners.get(key)
+                if listeners is not None and listener in listeners:
+                    listeners.remove(listener)
+                    if not listeners:
+                        del self._listeners[key]
+
+        return _remove
+
+    @callback
+    def publish(self, entity_id: str, cover) -> None:
+        targeted = self._listeners.get(entity_id, ())
+        broadcast = self._listeners.get(None, ())
+        if not targeted and not broadcast:
+            return
+        snapshot = cover.motion_snapshot()
+        self.published += 1
+        for listener in (*targeted, *broadcast):
+            listener(snapshot)
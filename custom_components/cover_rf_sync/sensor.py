@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from typing import Callable
+
+from homeassistant.components.sensor import SensorEntity, SensorStateClass
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+from .stats import EntryStats
+
+
+def _ms(value: float | None) -> float | None:
+    return round(value * 1000.0, 1) if value is not None else None
+
+
+_Reader = Callable[[EntryStats], float | int | None]
+
+# (chave, nome, unidade, state_class, leitura)
+SENSORS: tuple[tuple[str, str, str | None, SensorStateClass, _Reader], ...] = (
+    ("rf_latency", "RF latency", UnitOfTime.MILLISECONDS, SensorStateClass.MEASUREMENT,
+     lambda s: _ms(s.script_to_sensor.mean)),
+    ("command_to_start", "Command to start", UnitOfTime.MILLISECONDS, SensorStateClass.MEASUREMENT,
+     lambda s: _ms(s.command_to_start.mean)),
+    ("writes_per_movement", "Writes per movement", None, SensorStateClass.MEASUREMENT,
+     lambda s: round(s.writes_per_movement.mean, 1) if s.writes_per_movement.count else None),
+    ("movements", "Movements", None, SensorStateClass.TOTAL_INCREASING, lambda s: s.movements),
+    ("pending_expired", "Pending start expirations", None, SensorStateClass.TOTAL_INCREASING,
+     lambda s: s.pending_expired),
+    ("overlap_conflicts", "Overlapping movements", None, SensorStateClass.TOTAL_INCREASING,
+     lambda s: s.overlap_conflicts),
+)
+
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
+    """Adicionar os sensores de diagnóstico (desativados por omissão)."""
+    stats = hass.data[DOMAIN]["stats"].setdefault(entry.entry_id, EntryStats())
+    async_add_entities([CoverRFSyncStatSensor(entry, stats, *spec) for spec in SENSORS])
+
+
+class CoverRFSyncStatSensor(SensorEntity):
+    """Expõe um valor de EntryStats como sensor de diagnóstico.
+
+    Atualizado no fim de cada movimento (ou arranque abandonado), nunca durante.
+    """
+
+    _attr_should_poll = False
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self, entry: ConfigEntry, stats: EntryStats, key: str, name: str, unit, state_class, read
+    ):
+        self._stats = stats
+        self._read = read
+        self._attr_unique_id = f"{entry.entry_id}_{key}"
+        self._attr_name = f"{entry.title or 'Portão'} {name}"
+        self._attr_native_unit_of_measurement = unit
+        self._attr_state_class = state_class
+
+    async def async_added_to_hass(self) -> None:
+        self._stats.listeners.append(self._on_stats)
+
+    async def async_will_remove_from_hass(self) -> None:
+        self._stats.listeners.remove(self._on_stats)
+
+    @callback
+    def _on_stats(self) -> None:
+        self.async_write_ha_state()
+
+    @property
+    def native_value(self):
+        return self._read(self._stats)
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from typing import Any, Mapping, NamedTuple
+
+from homeassistant.config_entries import ConfigEntry
+
+from .const import (
+    CONF_AUTO_CALIBRATE,
+    CONF_CLOSE_DEBOUNCE,
+    CONF_CLOSE_DURATION,
+    CONF_CLOSE_SENSOR,
+    CONF_CONFIRM_RETRIES,
+    CONF_CONFIRM_TIMEOUT,
+    CONF_EVENT_ENTITY,
+    CONF_EVENT_FILTER,
+    CONF_EVENT_HOLDOFF,
+    CONF_EVENT_TYPE,
+    CONF_OPEN_DEBOUNCE,
+    CONF_OPEN_DURATION,
+    CONF_OPEN_SENSOR,
+    CONF_RF_LATENCY,
+    CONF_SCRIPT_ENTITY_ID,
+    CONF_STOP_SCRIPT_ENTITY_ID,
+    CONF_TOLERANCE,
+    CONF_TX_GAP,
+    CONF_TX_GROUP,
+    CONF_TX_REPEAT,
+    CONF_UPDATE_INTERVAL,
+)
+from .dispatcher import parse_event_filter
+
+DEFAULT_OPEN = 25
+DEFAULT_CLOSE = 25
+DEFAULT_TOL = 10.0  # %
+DEFAULT_UPDATE_INTERVAL = 0.5  # s entre atualizações de posição durante o movimento
+DEFAULT_TX_GROUP = "default"
+DEFAULT_TX_GAP = 300  # ms
+DEFAULT_TX_REPEAT = 1
+DEFAULT_CONFIRM_TIMEOUT = 5.0  # s
+DEFAULT_CONFIRM_RETRIES = 2
+DEFAULT_DEBOUNCE = 250  # ms
+DEFAULT_EVENT_HOLDOFF = 500  # ms; repetições da mesma trama RF neste tempo contam como um toque
+
+
+def _number(
+    value: Any, default: float, scale: float = 1.0, low: float = 0.0, high: float | None = None
+) -> float:
+    try:
+        result = max(low, float(value) * scale)
+    except (ValueError, TypeError):
+        result = default * scale
+    return min(high, result) if high is not None else result
+
+
+class CoverSettings(NamedTuple):
+    """Configuração resolvida de uma entrada (``options`` sobre ``data``), imutável.
+
+    Construída uma vez por entrada e substituída inteira quando as opções
+    mudam; a cover compara a anterior com a nova para aplicar só o que mudou.
+    Tempos em segundos.
+    """
+
+    open_duration: float
+    close_duration: float
+    tolerance: float
+    open_sensor: str | None
+    close_sensor: str | None
+    script: str | None
+    stop_script: str | None
+    rf_latency: float | None
+    update_interval: float
+    confirm_timeout: float
+    confirm_retries: int
+    open_debounce: float
+    close_debounce: float
+    event_entity: str | None
+    event_type: str | None
+    event_match: tuple[tuple[str, str], ...]         # filtro para eventos do barramento
+    event_entity_match: tuple[tuple[str, str], ...]  # filtro para atributos da entidade event
+    event_holdoff: float
+    auto_calibrate: bool
+    tx_group: str
+    tx_gap: float
+    tx_repeat: int
+
+    def sensor_binding(self, direction: str) -> tuple[str | None, float]:
+        """(sensor, anti-ressalto) da direção: o que define a sua subscrição."""
+        if direction == "open":
+            return self.open_sensor, self.open_debounce
+        return self.close_sensor, self.close_debounce
+
+    @property
+    def remote_binding(self) -> tuple:
+        """Campos que definem a subscrição do comando RF."""
+        return (
+            self.event_entity,
+            self.event_type,
+            self.event_match,
+            self.event_entity_match,
+            self.event_holdoff,
+        )
+
+    @classmethod
+    def from_entry(cls, entry: ConfigEntry) -> CoverSettings:
+        return cls.from_config(entry.data, entry.options or {})
+
+    @classmethod
+    def from_config(cls, data: Mapping[str, Any], options: Mapping[str, Any]) -> CoverSettings:
+        def get(key: str, default: Any = None) -> Any:
+            return options.get(key, data.get(key, default))
+
+        def first(key: str) -> Any:
+            # Valor vazio nas opções cai para o da criação
+            return options.get(key) or data.get(key)
+
+        script = first(CONF_SCRIPT_ENTITY_ID)
+        try:
+            latency = get(CONF_RF_LATENCY)
+            latency = max(0.0, float(latency) / 1000.0) if latency is not None else None
+        except (ValueError, TypeError):
+            latency = None  # medida pelos sensores
+        event_filter = first(CONF_EVENT_FILTER)
+        try:
+            retries = max(0, int(get(CONF_CONFIRM_RETRIES, DEFAULT_CONFIRM_RETRIES)))
+        except (ValueError, TypeError):
+            retries = DEFAULT_CONFIRM_RETRIES
+        try:
+            repeat = max(1, int(first(CONF_TX_REPEAT) or DEFAULT_TX_REPEAT))
+        except (ValueError, TypeError):
+            repeat = DEFAULT_TX_REPEAT
+        return cls(
+            open_duration=_number(first(CONF_OPEN_DURATION), DEFAULT_OPEN, low=1.0),
+            close_duration=_number(first(CONF_CLOSE_DURATION), DEFAULT_CLOSE, low=1.0),
+            tolerance=_number(get(CONF_TOLERANCE, DEFAULT_TOL), DEFAULT_TOL, high=50.0),
+            open_sensor=first(CONF_OPEN_SENSOR),
+            close_sensor=first(CONF_CLOSE_SENSOR),
+            script=script,
+            stop_script=first(CONF_STOP_SCRIPT_ENTITY_ID) or script,
+            rf_latency=latency,
+            update_interval=_number(
+                get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL), DEFAULT_UPDATE_INTERVAL
+            ),
+            confirm_timeout=_number(
+                get(CONF_CONFIRM_TIMEOUT, DEFAULT_CONFIRM_TIMEOUT), DEFAULT_CONFIRM_TIMEOUT
+            ),
+            confirm_retries=retries,
+            open_debounce=_number(
+                get(CONF_OPEN_DEBOUNCE, DEFAULT_DEBOUNCE), DEFAULT_DEBOUNCE, scale=0.001
+            ),
+            close_debounce=_number(
+                get(CONF_CLOSE_DEBOUNCE, DEFAULT_DEBOUNCE), DEFAULT_DEBOUNCE, scale=0.001
+            ),
+            event_entity=first(CONF_EVENT_ENTITY),
+            event_type=(first(CONF_EVENT_TYPE) or "").strip() or None,
+            event_match=tuple(parse_event_filter(event_filter, "code").items()),
+            event_entity_match=tuple(parse_event_filter(event_filter, "event_type").items()),
+            event_holdoff=_number(
+                get(CONF_EVENT_HOLDOFF, DEFAULT_EVENT_HOLDOFF), DEFAULT_EVENT_HOLDOFF, scale=0.001
+            ),
+            auto_calibrate=bool(get(CONF_AUTO_CALIBRATE, True)),
+            tx_group=first(CONF_TX_GROUP) or DEFAULT_TX_GROUP,
+            tx_gap=_number(get(CONF_TX_GAP, DEFAULT_TX_GAP), DEFAULT_TX_GAP, scale=0.001),
+            tx_repeat=repeat,
+        )
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from homeassistant.components.cover import CoverEntityFeature
+from homeassistant.const import STATE_CLOSED, STATE_CLOSING, STATE_OPEN, STATE_OPENING
+
+# Eventos
+EVENT_START_OPEN = "start_open"
+EVENT_START_CLOSE = "start_close"
+EVENT_STOP = "stop"                  # paragem a meio (utilizador, comando RF, serviço)
+EVENT_ARRIVE_OPEN = "arrive_open"    # fim de um movimento a abrir (alvo ou fim de curso)
+EVENT_ARRIVE_CLOSE = "arrive_close"  # fim de um movimento a fechar
+EVENT_RESET = "reset"                # só a posição é conhecida (arranque, reposição, tolerância)
+
+# Zonas de posição (dependem da tolerância)
+ZONE_CLOSED = "closed"  # <= tolerância
+ZONE_OPEN = "open"      # >= 100 - tolerância
+ZONE_LOW = "low"        # a meio, abaixo de 50
+ZONE_HIGH = "high"      # a meio, 50 ou mais
+
+ANY = "*"
+KEEP = None  # mantém a próxima ação atual
+
+# (evento, zona, estado) -> (estado, próxima ação). Procura do mais para o menos
+# específico: (evento, zona, estado), (evento, zona, ANY), (evento, ANY, ANY).
+TRANSITIONS: dict[tuple[str, str, str], tuple[str, str | None]] = {
+    (EVENT_START_OPEN, ANY, ANY): (STATE_OPENING, "stop"),
+    (EVENT_START_CLOSE, ANY, ANY): (STATE_CLOSING, "stop"),
+
+    # Nos extremos (dentro da tolerância) a próxima ação é sempre a inversa do extremo
+    (EVENT_STOP, ZONE_CLOSED, ANY): (STATE_CLOSED, "open"),
+    (EVENT_STOP, ZONE_OPEN, ANY): (STATE_OPEN, "close"),
+    (EVENT_ARRIVE_OPEN, ZONE_CLOSED, ANY): (STATE_CLOSED, "open"),
+    (EVENT_ARRIVE_OPEN, ZONE_OPEN, ANY): (STATE_OPEN, "close"),
+    (EVENT_ARRIVE_CLOSE, ZONE_CLOSED, ANY): (STATE_CLOSED, "open"),
+    (EVENT_ARRIVE_CLOSE, ZONE_OPEN, ANY): (STATE_OPEN, "close"),
+    (EVENT_RESET, ZONE_CLOSED, ANY): (STATE_CLOSED, "open"),
+    (EVENT_RESET, ZONE_OPEN, ANY): (STATE_OPEN, "close"),
+
+    # A meio: parado durante o movimento -> sentido inverso; já parado -> mantém
+    (EVENT_STOP, ZONE_LOW, STATE_OPENING): (STATE_CLOSED, "close"),
+    (EVENT_STOP, ZONE_HIGH, STATE_OPENING): (STATE_OPEN, "close"),
+    (EVENT_STOP, ZONE_LOW, STATE_CLOSING): (STATE_CLOSED, "open"),
+    (EVENT_STOP, ZONE_HIGH, STATE_CLOSING): (STATE_OPEN, "open"),
+    (EVENT_STOP, ZONE_LOW, ANY): (STATE_CLOSED, KEEP),
+    (EVENT_STOP, ZONE_HIGH, ANY): (STATE_OPEN, KEEP),
+    (EVENT_ARRIVE_OPEN, ZONE_LOW, ANY): (STATE_CLOSED, "close"),
+    (EVENT_ARRIVE_OPEN, ZONE_HIGH, ANY): (STATE_OPEN, "close"),
+    (EVENT_ARRIVE_CLOSE, ZONE_LOW, ANY): (STATE_CLOSED, "open"),
+    (EVENT_ARRIVE_CLOSE, ZONE_HIGH, ANY): (STATE_OPEN, "open"),
+    (EVENT_RESET, ZONE_LOW, ANY): (STATE_CLOSED, "open"),
+    (EVENT_RESET, ZONE_HIGH, ANY): (STATE_OPEN, "close"),
+}
+
+# Botões dinâmicos: parado -> só a próxima ação; em movimento -> abrir/fechar/parar
+FEATURES: dict[str, int] = {
+    "open": CoverEntityFeature.SET_POSITION | CoverEntityFeature.OPEN,
+    "close": CoverEntityFeature.SET_POSITION | CoverEntityFeature.CLOSE,
+    "stop": (
+        CoverEntityFeature.SET_POSITION
+        | CoverEntityFeature.OPEN
+        | CoverEntityFeature.CLOSE
+        | CoverEntityFeature.STOP
+    ),
+}
+
+
+def position_zone(position: float, tolerance: float) -> str:
+    if position <= tolerance:
+        return ZONE_CLOSED
+    if position >= 100.0 - tolerance:
+        return ZONE_OPEN
+    return ZONE_HIGH if position >= 50 else ZONE_LOW
+
+
+def transition(state: str, next_action: str, event: str, zone: str) -> tuple[str, str]:
+    """Aplica ``event`` ao par (estado, próxima ação) na ``zone`` dada."""
+    result = (
+        TRANSITIONS.get((event, zone, state))
+        or TRANSITIONS.get((event, zone, ANY))
+        or TRANSITIONS[(event, ANY, ANY)]
+    )
+    new_state, new_next = result
+    return new_state, next_action if new_next is KEEP else new_next
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from typing import Any, Callable
+
+# Limites superiores dos buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0)  # s
+WRITES_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100, 200, 500)  # escritas por movimento
+
+
+class Histogram:
+    """Histograma de buckets fixos, pré-alocado: registar não aloca memória."""
+
+    __slots__ = ("bounds", "counts", "count", "total", "max")
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        # Um contador por balde; o último é o de transbordo
+        self.counts = array("L", bytes(array("L").itemsize * (len(bounds) + 1)))
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def mean(self) -> float | None:
+        return self.total / self.count if self.count else None
+
+    def quantile(self, q: float) -> float | None:
+        """Aproximação pelo limite superior do bucket que contém o quantil."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return self.bounds[i] if i < len(self.bounds) else self.max
+        return self.max
+
+    def as_dict(self) -> dict[str, Any]:
+        labels = [f"<={b}" for b in self.bounds] + [f">{self.bounds[-1]}"]
+        return {
+            "count": self.count,
+            "mean": round(self.mean, 4) if self.count else None,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "max": round(self.max, 4),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class EntryStats:
+    """Contadores e histogramas de uma entrada (uma cover)."""
+
+    __slots__ = (
+        "script_to_sensor",
+        "command_to_start",
+        "writes_per_movement",
+        "movements",
+        "pending_expired",
+        "pending_abandoned",
+        "overlap_conflicts",
+        "listeners",
+    )
+
+    def __init__(self):
+        self.script_to_sensor = Histogram(LATENCY_BUCKETS)    # pulso enviado -> sensor confirma
+        self.command_to_start = Histogram(LATENCY_BUCKETS)    # comando -> início do movimento
+        self.writes_per_movement = Histogram(WRITES_BUCKETS)
+        self.movements = 0
+        self.pending_expired = 0     # prazos de confirmação expirados (inclui reenvios)
+        self.pending_abandoned = 0   # arranques pendentes abandonados após a última tentativa
+        self.overlap_conflicts = 0   # movimento iniciado com outro ainda em curso
+        self.listeners: list[Callable[[], None]] = []  # sensores de diagnóstico ativos
+
+    def finish_movement(self, writes: int) -> None:
+        """Fecha as contas de um movimento e avisa os sensores (uma vez por movimento)."""
+        self.writes_per_movement.record(writes)
+        self.notify()
+
+    def notify(self) -> None:
+        for listener in self.listeners:
+            listener()
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "script_to_sensor_s": self.script_to_sensor.as_dict(),
+            "command_to_start_s": self.command_to_start.as_dict(),
+            "writes_per_movement": self.writes_per_movement.as_dict(),
+            "movements": self.movements,
+            "pending_expired": self.pending_expired,
+            "pending_abandoned": self.pending_abandoned,
+            "overlap_conflicts": self.overlap_conflicts,
+        }
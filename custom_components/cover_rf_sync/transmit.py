@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# Prioridades (menor = primeiro): paragens passam à frente de abrir/fechar
+PRIORITY_STOP = 0
+PRIORITY_MOVE = 1
+
+
+class _Frame:
+    __slots__ = ("script", "priority", "gap", "repeat", "futures")
+
+    def __init__(self, script: str, priority: int, gap: float, repeat: int, future: asyncio.Future):
+        self.script = script
+        self.priority = priority
+        self.gap = gap
+        self.repeat = repeat
+        self.futures = [future]  # um por pedido; a trama é partilhada
+
+    @property
+    def cancelled(self) -> bool:
+        return all(future.cancelled() for future in self.futures)
+
+    def resolve(self, sent: float) -> None:
+        for future in self.futures:
+            if not future.done():
+                future.set_result(sent)
+
+    def cancel(self) -> None:
+        for future in self.futures:
+            future.cancel()
+
+
+class RFTransmitter:
+    """Fila de emissão de um grupo de transmissores (um rádio partilhado).
+
+    Serializa as chamadas ``script.turn_on`` do grupo, respeitando um
+    intervalo mínimo entre tramas e repetindo cada trama ``repeat`` vezes.
+    ``async_enqueue`` devolve um futuro que resolve com o instante
+    (``loop.time()``) em que a trama saiu de facto; cancelar o futuro retira
+    a trama da fila se ainda não tiver sido enviada. Uma trama cujo envio
+    falhe fica também cancelada.
+
+    Pedidos do mesmo script com a mesma prioridade enquanto a trama ainda
+    espera na fila são fundidos nela: covers que partilham um código RF
+    movem-se com um só pulso (um segundo pulso seria uma paragem). Cada
+    pedido recebe o seu futuro; a trama só sai da fila quando todos forem
+    cancelados.
+    """
+
+    def __init__(self, hass: HomeAssistant, group: str):
+        self._hass = hass
+        self.group = group
+        self._queue: list[tuple[int, int, _Frame]] = []
+        self._waiting: dict[tuple[str, int], _Frame] = {}  # (script, prioridade) -> por enviar
+        self._seq = itertools.count()
+        self._task: asyncio.Task | None = None
+        self._last_sent: float | None = None
+        self._last_gap: float = 0.0
+        self.frames_sent = 0
+        self.frames_merged = 0
+
+    @property
+    def queued(self) -> int:
+        return len(self._queue)
+
+    @callback
+    def async_enqueue(
+        self, script: str, priority: int = PRIORITY_MOVE, gap: float = 0.0, repeat: int = 1
+    ) -> asyncio.Future:
+        future = self._hass.loop.create_future()
+        frame = self._waiting.get((script, priority))
+        if frame is not None and not frame.cancelled:
+            frame.futures.append(future)
+            frame.gap = max(frame.gap, gap)
+            frame.repeat = max(frame.repeat, int(repeat))
+            self.frames_merged += 1
+            return future
+        frame = _Frame(script, priority, max(0.0, gap), max(1, int(repeat)), future)
+        self._waiting[(script, priority)] = frame
+        heapq.heappush(self._queue, (priority, next(self._seq), frame))
+        if self._task is None or self._task.done():
+            # Sem arranque ansioso: o trabalhador só corre no próximo ciclo, pelo que os
+            # pedidos feitos no mesmo tick (ex.: covers de um grupo) ainda se fundem
+            self._task = self._hass.async_create_background_task(
+                self._async_worker(), f"{DOMAIN} rf transmitter {self.group}", eager_start=False
+            )
+        return future
+
+    def _gap_remaining(self, gap: float) -> float:
+        if self._last_sent is None:
+            return 0.0
+        return self._last_sent + gap - self._hass.loop.time()
+
+    async def _async_worker(self) -> None:
+        loop = self._hass.loop
+        while self._queue:
+            _, _, frame = self._queue[0]
+            if frame.cancelled:
+                heapq.heappop(self._queue)
+                self._forget(frame)
+                continue
+            # Espera o intervalo mínimo antes de retirar a trama; depois
+            # reavalia o topo, para que uma paragem entretanto chegada passe à frente
+            delay = self._gap_remaining(max(self._last_gap, frame.gap))
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            heapq.heappop(self._queue)
+            self._forget(frame)
+
+            try:
+                for attempt in range(frame.repeat):
+                    delay = self._gap_remaining(frame.gap) if attempt else 0.0
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    await self._hass.services.async_call(
+                        "script", "turn_on", {"entity_id": frame.script}, blocking=False
+                    )
+                    self._last_sent = loop.time()
+                    self._last_gap = frame.gap
+                    self.frames_sent += 1
+                    # O movimento conta a partir da primeira emissão
+                    frame.resolve(self._last_sent)
+            except Exception as err:  # noqa: BLE001
+                _LOGGER.warning(
+                    "Falha ao enviar %s pelo transmissor %s: %s", frame.script, self.group, err
+                )
+                # Trama não enviada: para quem espera equivale a cancelada
+                frame.cancel()
+
+    def _forget(self, frame: _Frame) -> None:
+        # A partir daqui novos pedidos do mesmo script dão origem a outra trama
+        key = (frame.script, frame.priority)
+        if self._waiting.get(key) is frame:
+            del self._waiting[key]
+
+    @callback
+    def async_shutdown(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for _, _, frame in self._queue:
+            frame.cancel()
+        self._queue.clear()
+        self._waiting.clear()
+
+
+@callback
+def async_get_transmitter(hass: HomeAssistant, group: str) -> RFTransmitter:
+    """Transmissor partilhado do grupo (criado na primeira utilização)."""
+    transmitters = hass.data[DOMAIN].setdefault("transmitters", {})
+    transmitter = transmitters.get(group)
+    if transmitter is None:
+        transmitter = transmitters[group] = RFTransmitter(hass, group)
+    return transmitter
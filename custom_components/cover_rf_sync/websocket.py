@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
+
+from .const import DOMAIN
+
+
+@callback
+def async_register_websocket(hass: HomeAssistant) -> None:
+    websocket_api.async_register_command(hass, websocket_subscribe_motion)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/subscribe_motion",
+        vol.Optional("entity_id"): cv.entity_ids,
+    }
+)
+@callback
+def websocket_subscribe_motion(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Envia o segmento de movimento de cada cover agora e sempre que mudar.
+
+    Sem ``entity_id`` segue todas as covers da integração. Cada mensagem traz
+    ``origin``, ``velocity`` (%/s), ``target``, ``start`` e ``eta`` (epoch, s):
+    a posição em ``t`` é ``origin + velocity * (t - start)`` limitada a ``target``.
+    """
+    msg_id = msg["id"]
+    entity_ids = msg.get("entity_id")
+
+    @callback
+    def _forward(snapshot: dict[str, Any]) -> None:
+        connection.send_message(websocket_api.event_message(msg_id, snapshot))
+
+    feed = hass.data[DOMAIN]["motion_feed"]
+    connection.subscriptions[msg_id] = feed.async_subscribe(entity_ids, _forward)
+    connection.send_result(msg_id)
+    for entity_id, entity in hass.data[DOMAIN]["entities"].items():
+        if entity_ids is None or entity_id in entity_ids:
+            _forward(entity.motion_snapshot())
@@ -0,0 +1,13 @@
+"""Os testes correm sobre o stand-in do HA do benchmark (benchmarks/hass_stub.py).
+
+Instalado antes de qualquer import da integração, para que a suite não
+dependa de um Home Assistant instalado e corra em relógio virtual.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "benchmarks"))
+
+import hass_stub  # noqa: E402
+
+hass_stub.install()
@@ -0,0 +1,132 @@
+"""Cenários da entidade contra um motor de um só botão simulado, em relógio virtual."""
+from __future__ import annotations
+
+import asyncio
+import json
+
+import bench_cover
+import hass_stub
+from bench_cover import DOMAIN, PhysicalMotor
+
+SCRIPT = "script.gate"
+
+
+def _run(scenario, **data):
+    """Corre ``scenario(hass, cover, motor)`` com uma cover de 25 s e sensores nos dois sentidos."""
+    loop = hass_stub.VirtualClockLoop()
+    asyncio.set_event_loop(loop)
+    hass = hass_stub.HomeAssistant(loop)
+
+    async def _main():
+        motor = PhysicalMotor(hass, 25, 0.3, "binary_sensor.o", "binary_sensor.c")
+        bench_cover._register_motors(hass, {SCRIPT: motor})
+        hass.states.async_set("binary_sensor.o", "off")
+        hass.states.async_set("binary_sensor.c", "off")
+        config = {
+            "name": "gate",
+            "open_duration": 25,
+            "close_duration": 25,
+            "script_entity_id": SCRIPT,
+            "open_sensor": "binary_sensor.o",
+            "close_sensor": "binary_sensor.c",
+        }
+        config.update(data)
+        (cover,) = await bench_cover._async_setup(hass, 1, lambda i: config)
+        await scenario(hass, cover, motor)
+
+    try:
+        loop.run_until_complete(_main())
+    finally:
+        for task in asyncio.all_tasks(loop):
+            task.cancel()
+        loop.run_until_complete(asyncio.sleep(0))
+        loop.close()
+    return hass
+
+
+def test_sensor_in_other_direction_cancels_pending_retry():
+    async def scenario(hass, cover, motor):
+        # Abre até meio e pára com um segundo pulso: a próxima ação passa a ser fechar
+        await hass.services.async_call(DOMAIN, "activate_script", {"entity_id": [cover.entity_id]})
+        await asyncio.sleep(12.5)
+        await hass.services.async_call(DOMAIN, "activate_script", {"entity_id": [cover.entity_id]})
+        await asyncio.sleep(2)
+        assert cover.extra_state_attributes["next_action"] == "close"
+
+        # Abrir pedido, mas o motor segue o ciclo e fecha: o sensor de fecho confirma
+        # o movimento real e o reenvio do arranque de abrir não pode sair (pararia o motor)
+        await cover.async_open_cover()
+        await asyncio.sleep(30)
+        assert motor.direction is None
+        assert motor.position_now() == 0.0
+        assert cover.current_cover_position == 0
+        assert cover._pending_start is None
+
+    hass = _run(scenario)
+    assert hass.services.calls[("script", "turn_on")] == 3
+
+
+def test_set_position_reversal_while_moving_stops_and_restarts_motor():
+    async def scenario(hass, cover, motor):
+        await cover.async_set_cover_position(position=80)
+        await asyncio.sleep(12.9)  # ~50% (latência 0.4 s)
+        await cover.async_set_cover_position(position=20)
+        await asyncio.sleep(30)
+        assert motor.direction is None
+        assert abs(motor.position_now() - 20) <= 1
+        assert abs(cover.current_cover_position - motor.position_now()) <= 1
+
+    hass = _run(scenario, open_sensor=None, close_sensor=None, rf_latency_ms=400, tx_gap_ms=300)
+    # arranque, paragem e novo arranque ao contrário, paragem no alvo
+    assert hass.services.calls[("script", "turn_on")] == 4
+
+
+def test_stop_is_persisted_and_restored():
+    async def scenario(hass, cover, motor):
+        await cover.async_open_cover()
+        await asyncio.sleep(10)
+        await cover.async_stop_cover()
+        await asyncio.sleep(2)
+        stored = json.loads(hass.storage[f"{DOMAIN}.{cover.entry.entry_id}"])
+        assert round(stored["position"]) == 40
+        assert stored["motion"] is None
+
+        entry = cover.entry
+        await hass.config_entries.async_unload_platforms(entry, ["cover"])
+        await hass.config_entries.async_forward_entry_setups(entry, ["cover"])
+        (restored,) = hass.config_entries.entities[entry.entry_id]
+        assert restored is not cover
+        assert restored.current_cover_position == 40
+        assert restored.extra_state_attributes["next_action"] == "close"
+
+    _run(scenario, script_entity_id=None, open_sensor=None, close_sensor=None)
+
+
+def test_arrival_within_scheduler_slack_needs_no_extra_wakeup():
+    loop = hass_stub.VirtualClockLoop()
+    asyncio.set_event_loop(loop)
+    hass = hass_stub.HomeAssistant(loop)
+
+    async def _main():
+        # Chegadas a 20 ms uma da outra: tratadas no mesmo despertar, sem tick intermédio
+        covers = await bench_cover._async_setup(
+            hass,
+            2,
+            lambda i: {
+                "name": f"c{i}",
+                "open_duration": 20 + 0.02 * i,
+                "close_duration": 20,
+                "update_interval": 0,
+            },
+        )
+        writes = hass.states.writes["cover"]
+        await asyncio.gather(*(cover.async_open_cover() for cover in covers))
+        await asyncio.sleep(30)
+        assert [cover.current_cover_position for cover in covers] == [100, 100]
+        assert hass.states.writes["cover"] - writes == 4  # arranque e chegada de cada uma
+        assert hass.data[DOMAIN]["scheduler"].wakeups == 1
+
+    try:
+        loop.run_until_complete(_main())
+    finally:
+        loop.close()
@@ -0,0 +1,133 @@
+"""Propriedades da tabela de transições (state.py), incluindo a equivalência
+com a lógica de paragem/chegada/reposição que existia antes da tabela."""
+from __future__ import annotations
+
+import random
+
+import pytest
+from homeassistant.const import STATE_CLOSED, STATE_CLOSING, STATE_OPEN, STATE_OPENING
+
+from custom_components.cover_rf_sync.state import (
+    EVENT_ARRIVE_CLOSE,
+    EVENT_ARRIVE_OPEN,
+    EVENT_RESET,
+    EVENT_START_CLOSE,
+    EVENT_START_OPEN,
+    EVENT_STOP,
+    FEATURES,
+    ZONE_CLOSED,
+    ZONE_HIGH,
+    ZONE_LOW,
+    ZONE_OPEN,
+    position_zone,
+    transition,
+)
+
+STATES = (STATE_OPEN, STATE_CLOSED, STATE_OPENING, STATE_CLOSING)
+NEXT_ACTIONS = ("open", "close", "stop")
+EVENTS = (
+    EVENT_START_OPEN,
+    EVENT_START_CLOSE,
+    EVENT_STOP,
+    EVENT_ARRIVE_OPEN,
+    EVENT_ARRIVE_CLOSE,
+    EVENT_RESET,
+)
+TOLERANCES = (0.0, 1.0, 5.0, 10.0, 25.0, 40.0)
+
+
+def _baseline(
+    state: str, next_action: str, event: str, position: float, tol: float
+) -> tuple[str, str]:
+    """Lógica original de cover.py (_begin_movement, paragem, fim do movimento, reposição)."""
+    if event == EVENT_START_OPEN:
+        return STATE_OPENING, "stop"
+    if event == EVENT_START_CLOSE:
+        return STATE_CLOSING, "stop"
+    if position <= tol:
+        return STATE_CLOSED, "open"
+    if position >= 100.0 - tol:
+        return STATE_OPEN, "close"
+    new_state = STATE_OPEN if position >= 50 else STATE_CLOSED
+    if event == EVENT_STOP:
+        if state == STATE_OPENING:
+            next_action = "close"
+        elif state == STATE_CLOSING:
+            next_action = "open"
+        return new_state, next_action
+    if event == EVENT_ARRIVE_OPEN:
+        return new_state, "close"
+    if event == EVENT_ARRIVE_CLOSE:
+        return new_state, "open"
+    return new_state, "close" if position >= 50 else "open"
+
+
+def _positions(tol: float) -> list[float]:
+    # Grelha regular mais as fronteiras das zonas e os seus vizinhos
+    edges = (tol, 100.0 - tol, 50.0)
+    extra = [e + d for e in edges for d in (-1e-9, 0.0, 1e-9)]
+    return sorted({p / 2 for p in range(201)} | {min(100.0, max(0.0, p)) for p in extra})
+
+
+@pytest.mark.parametrize("tol", TOLERANCES)
+def test_matches_baseline(tol: float) -> None:
+    for position in _positions(tol):
+        zone = position_zone(position, tol)
+        for state in STATES:
+            for next_action in NEXT_ACTIONS:
+                for event in EVENTS:
+                    assert transition(state, next_action, event, zone) == _baseline(
+                        state, next_action, event, position, tol
+                    ), (state, next_action, event, position, tol)
+
+
+@pytest.mark.parametrize("tol", TOLERANCES)
+def test_position_zone(tol: float) -> None:
+    for position in _positions(tol):
+        zone = position_zone(position, tol)
+        if position <= tol:
+            assert zone == ZONE_CLOSED
+        elif position >= 100.0 - tol:
+            assert zone == ZONE_OPEN
+        else:
+            assert zone == (ZONE_HIGH if position >= 50 else ZONE_LOW)
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_random_walk_invariants(seed: int) -> None:
+    """Sequências aleatórias de comandos sobre uma cover simulada."""
+    rng = random.Random(seed)
+    tol = rng.choice(TOLERANCES[:-1])
+    position = rng.uniform(0.0, 100.0)
+    state, next_action = transition(STATE_CLOSED, "open", EVENT_RESET, position_zone(position, tol))
+
+    for _ in range(400):
+        moving = state in (STATE_OPENING, STATE_CLOSING)
+        if moving:
+            # Anda até um ponto do percurso e pára ou chega ao alvo
+            opening = state == STATE_OPENING
+            end = rng.uniform(position, 100.0) if opening else rng.uniform(0.0, position)
+            if rng.random() < 0.3:
+                end = 100.0 if opening else 0.0
+            position = end
+            if rng.random() < 0.5:
+                event = EVENT_STOP
+            else:
+                event = EVENT_ARRIVE_OPEN if opening else EVENT_ARRIVE_CLOSE
+        else:
+            event = rng.choice((EVENT_START_OPEN, EVENT_START_CLOSE, EVENT_STOP, EVENT_RESET))
+            if event == EVENT_RESET:
+                position = rng.uniform(0.0, 100.0)
+        state, next_action = transition(state, next_action, event, position_zone(position, tol))
+
+        moving = state in (STATE_OPENING, STATE_CLOSING)
+        assert (next_action == "stop") == moving, (seed, event, state, next_action)
+        assert next_action in FEATURES
+        if moving:
+            continue
+        if position <= tol:
+            assert (state, next_action) == (STATE_CLOSED, "open")
+        elif position >= 100.0 - tol:
+            assert (state, next_action) == (STATE_OPEN, "close")
+        else:
+            assert state == (STATE_OPEN if position >= 50 else STATE_CLOSED)